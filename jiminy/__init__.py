@@ -5,13 +5,17 @@ Modules in this package may modify state.
 Erasing the contents of each container below will completely zero out
 the currently held state of avalon-core.
 
+Containers are copy-on-write registries, see :mod:`registry`.
+
 """
 
-_registered_plugins = dict()
-_registered_plugin_paths = dict()
-_registered_root = {"_": ""}
-_registered_host = {"_": None}
-_registered_config = {"_": None}
-_registered_event_handlers = dict()
+from .registry import Registry
+
+_registered_plugins = Registry()
+_registered_plugin_paths = Registry()
+_registered_root = Registry({"_": ""})
+_registered_host = Registry({"_": None})
+_registered_config = Registry({"_": None})
+_registered_event_handlers = Registry()
 
 Session = {}
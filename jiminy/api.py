@@ -2,12 +2,19 @@
 from .pipeline import (
     install,
     uninstall,
+    switch_config,
 
     Creator,
 
     create,
+    create_many,
+    discover_manifest,
+    write_manifest,
+    compatible_loaders,
+    compatible_loaders_many,
 
     on,
+    off,
     after,
     before,
     emit,
@@ -25,12 +32,19 @@ from .lib import (
 __all__ = [
     "install",
     "uninstall",
+    "switch_config",
 
     "Creator",
 
     "create",
+    "create_many",
+    "discover_manifest",
+    "write_manifest",
+    "compatible_loaders",
+    "compatible_loaders_many",
 
     "on",
+    "off",
     "after",
     "before",
     "emit",
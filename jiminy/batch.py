@@ -0,0 +1,471 @@
+"""Headless batch runner
+
+Distributes jobs across a pool of worker processes, each installing the
+pipeline once and then running one job after another.
+
+Usage:
+    $ python -m jiminy.batch jobs.json --workers 4 --timeout 600
+
+Where `jobs.json` holds a list of jobs, such as
+
+    [
+        {"type": "create",
+         "scene": "/projects/hero/model.ma",
+         "instances": [{"name": "modelDefault",
+                        "asset": "hero",
+                        "family": "jiminy.model"}]},
+        {"type": "publish",
+         "scene": "/projects/hero/rig.ma"}
+    ]
+
+Workers run in `mayapy`, found via $MAYA_LOCATION or $PATH, falling back
+to the current interpreter. Workers install the pipeline as usual, or
+restore it from a snapshot written by `pipeline.snapshot_state()`.
+
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import subprocess
+
+from .vendor import six
+
+log = logging.getLogger(__name__)
+
+# Prefix of lines written by workers, other output is merely logged
+PROTOCOL = "jiminy-batch:"
+
+
+def _create(job):
+    """Create `instances` in `scene`, and save it"""
+    from maya import cmds
+    from . import api
+
+    cmds.file(job["scene"], open=True, force=True)
+
+    created = api.create_many(job["instances"])
+
+    cmds.file(save=True, force=True)
+
+    return {"instances": created}
+
+
+def _publish(job):
+    """Publish `scene`"""
+    from maya import cmds
+    import pyblish.util
+
+    cmds.file(job["scene"], open=True, force=True)
+
+    context = pyblish.util.publish()
+
+    errors = [
+        str(result["error"]) for result in context.data.get("results", [])
+        if result["error"]
+    ]
+
+    if errors:
+        raise RuntimeError("\n".join(errors))
+
+    return {"instances": [instance.data["name"] for instance in context]}
+
+
+JOBS = {
+    "create": _create,
+    "publish": _publish,
+}
+
+
+class Worker(object):
+    """Process installing the pipeline once, then running jobs
+
+    Arguments:
+        executable (str): Python interpreter, typically mayapy
+        snapshot (str, optional): Restore pipeline from this snapshot
+            rather than installing it
+
+    """
+
+    def __init__(self, executable, snapshot=None):
+        args = [executable, "-u", "-m", "jiminy.batch", "--worker"]
+        if snapshot:
+            args += ["--snapshot", snapshot]
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join(
+            path for path in (_root(), env.get("PYTHONPATH")) if path
+        )
+
+        self.jobs = 0
+        self.popen = subprocess.Popen(args,
+                                      stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE,
+                                      env=env,
+                                      universal_newlines=True)
+
+        self._responses = six.moves.queue.Queue()
+        reader = threading.Thread(target=self._read)
+        reader.daemon = True
+        reader.start()
+
+    def _read(self):
+        for line in iter(self.popen.stdout.readline, ""):
+            if line.startswith(PROTOCOL):
+                self._responses.put(json.loads(line[len(PROTOCOL):]))
+            else:
+                log.debug("[%s] %s" % (self.popen.pid, line.rstrip()))
+
+        # Process has exited
+        self._responses.put(None)
+
+    def _receive(self, timeout):
+        try:
+            response = self._responses.get(timeout=timeout)
+        except six.moves.queue.Empty:
+            self.kill()
+            raise RuntimeError("Timed out after %ss" % timeout)
+
+        if response is None:
+            raise RuntimeError("Worker exited with %s" % self.popen.wait())
+
+        return response
+
+    def wait_until_ready(self, timeout=None):
+        response = self._receive(timeout)
+        if not response.get("ready"):
+            self.kill()
+            raise RuntimeError("Worker failed to start: %s"
+                               % response.get("error"))
+
+    def run(self, job, timeout=None):
+        """Run `job`, returning its result
+
+        Raises:
+            RuntimeError on timeout, or worker exiting prematurely
+
+        """
+
+        self.jobs += 1
+
+        try:
+            self.popen.stdin.write(json.dumps(job) + "\n")
+            self.popen.stdin.flush()
+        except (IOError, OSError):
+            raise RuntimeError("Worker exited with %s" % self.popen.wait())
+
+        return self._receive(timeout)
+
+    def stop(self):
+        try:
+            self.popen.stdin.close()
+            self.popen.wait()
+        except (IOError, OSError):
+            self.kill()
+
+    def kill(self):
+        if self.popen.poll() is None:
+            self.popen.kill()
+            self.popen.wait()
+
+
+class Pool(object):
+    """Workers running jobs concurrently
+
+    Arguments:
+        workers (int): Number of concurrent worker processes
+        executable (str, optional): Python interpreter of workers,
+            defaults to `find_mayapy()`
+        snapshot (str, optional): Pipeline snapshot for workers to restore
+        timeout (float, optional): Seconds after which a job is aborted,
+            and its worker killed
+        recycle (int, optional): Replace each worker after this many jobs,
+            containing any leaks. 0 means never.
+        startup_timeout (float, optional): Seconds after which a worker
+            not yet ready is killed, failing the job it was started for.
+            Defaults to `timeout`.
+
+    """
+
+    def __init__(self,
+                 workers=1,
+                 executable=None,
+                 snapshot=None,
+                 timeout=None,
+                 recycle=0,
+                 startup_timeout=None):
+        self.workers = workers
+        self.executable = executable or find_mayapy()
+        self.snapshot = snapshot
+        self.timeout = timeout
+        self.recycle = recycle
+        self.startup_timeout = startup_timeout or timeout
+
+        self._lock = threading.Lock()
+        self._spawned = 0
+
+    def _spawn(self):
+        started = time.time()
+        worker = Worker(self.executable, self.snapshot)
+        worker.wait_until_ready(self.startup_timeout)
+
+        with self._lock:
+            self._spawned += 1
+
+        log.info("Worker %s ready in %.2fs"
+                 % (worker.popen.pid, time.time() - started))
+        return worker
+
+    def run(self, jobs):
+        """Run each of `jobs`, returning a report
+
+        Returns:
+            dict: Report, see `format_report()`
+
+        """
+
+        pending = six.moves.queue.Queue()
+        for index, job in enumerate(jobs):
+            pending.put((index, job))
+
+        results = [None] * len(jobs)
+        started = time.time()
+
+        def work():
+            worker = None
+            try:
+                while True:
+                    try:
+                        index, job = pending.get_nowait()
+                    except six.moves.queue.Empty:
+                        break
+
+                    if worker is None:
+                        try:
+                            worker = self._spawn()
+                        except RuntimeError as e:
+                            log.error(e)
+                            results[index] = {"status": "error",
+                                              "type": job.get("type"),
+                                              "error": str(e),
+                                              "duration": 0.0}
+                            break
+
+                    results[index] = self._run_job(worker, job)
+
+                    if worker.popen.poll() is not None:
+                        # Killed on timeout, or crashed
+                        worker = None
+
+                    elif self.recycle and worker.jobs >= self.recycle:
+                        worker.stop()
+                        worker = None
+
+            finally:
+                if worker is not None:
+                    worker.stop()
+
+        threads = [
+            threading.Thread(target=work)
+            for _ in range(min(self.workers, len(jobs)))
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        duration = time.time() - started
+
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {"status": "error",
+                                  "type": jobs[index].get("type"),
+                                  "error": "Not run, no worker available",
+                                  "duration": 0.0}
+
+        return {
+            "jobs": results,
+            "duration": duration,
+            "workers": self.workers,
+            "spawned": self._spawned,
+            "succeeded": sum(1 for r in results if r["status"] == "ok"),
+            "failed": sum(1 for r in results if r["status"] == "error"),
+            "timedOut": sum(1 for r in results if r["status"] == "timeout"),
+            "throughput": len(results) / duration * 60 if duration else 0,
+        }
+
+    def _run_job(self, worker, job):
+        started = time.time()
+
+        try:
+            result = worker.run(job, self.timeout)
+        except RuntimeError as e:
+            status = "timeout" if "Timed out" in str(e) else "error"
+            result = {"status": status, "error": str(e)}
+
+        result["type"] = job.get("type")
+        result["duration"] = time.time() - started
+
+        log.info("%s %s: %s (%.2fs)" % (job.get("type"),
+                                        job.get("scene"),
+                                        result["status"],
+                                        result["duration"]))
+        return result
+
+
+def format_report(report):
+    """Return human readable summary of `report` from `Pool.run()`"""
+    lines = [
+        "%d jobs in %.1fs, %.1f jobs/min" % (len(report["jobs"]),
+                                             report["duration"],
+                                             report["throughput"]),
+        "  succeeded: %d" % report["succeeded"],
+        "  failed: %d" % report["failed"],
+        "  timed out: %d" % report["timedOut"],
+        "  workers: %d, spawned: %d" % (report["workers"],
+                                        report["spawned"]),
+    ]
+
+    durations = sorted(job["duration"] for job in report["jobs"])
+    if durations:
+        lines.append("  job duration: min %.2fs, median %.2fs, max %.2fs" % (
+            durations[0], durations[len(durations) // 2], durations[-1]))
+
+    for index, job in enumerate(report["jobs"]):
+        if job["status"] != "ok":
+            lines.append("  #%d %s: %s" % (index, job["status"], job["error"]))
+
+    return "\n".join(lines)
+
+
+def find_mayapy():
+    """Return path to mayapy, or the current interpreter if not found"""
+    fname = "mayapy.exe" if os.name == "nt" else "mayapy"
+
+    candidates = list()
+    if os.getenv("MAYA_LOCATION"):
+        candidates.append(os.path.join(os.environ["MAYA_LOCATION"],
+                                       "bin",
+                                       fname))
+
+    for path in os.getenv("PATH", "").split(os.pathsep):
+        candidates.append(os.path.join(path, fname))
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+
+    log.warning("mayapy not found, using %s" % sys.executable)
+    return sys.executable
+
+
+def _root():
+    """Return directory containing the jiminy package"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _respond(data):
+    sys.stdout.write(PROTOCOL + json.dumps(data) + "\n")
+    sys.stdout.flush()
+
+
+def _worker(snapshot=None):
+    """Install pipeline, then run jobs read from stdin until it closes"""
+    try:
+        try:
+            import maya.standalone
+        except ImportError:
+            pass  # Not in mayapy, jobs requiring Maya will fail
+        else:
+            maya.standalone.initialize(name="python")
+
+        from . import pipeline
+
+        if snapshot:
+            pipeline.restore_state(snapshot)
+        else:
+            pipeline.install()
+
+    except Exception as e:
+        _respond({"ready": False, "error": "%s: %s" % (type(e).__name__, e)})
+        return 1
+
+    _respond({"ready": True})
+
+    for line in iter(sys.stdin.readline, ""):
+        job = json.loads(line)
+
+        try:
+            result = JOBS[job["type"]](job)
+        except Exception as e:
+            log.exception("Job failed")
+            _respond({"status": "error",
+                      "error": "%s: %s" % (type(e).__name__, e)})
+        else:
+            _respond({"status": "ok", "result": result})
+
+    return 0
+
+
+def _cli(args):
+    """jiminy.batch command-line interface"""
+    parser = argparse.ArgumentParser(prog="python -m jiminy.batch")
+    parser.add_argument("jobs", nargs="?",
+                        help="Path to JSON file with list of jobs")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of concurrent workers")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds after which a job is aborted")
+    parser.add_argument("--startup-timeout", type=float, default=None,
+                        help="Seconds after which a worker not yet ready "
+                             "is killed, defaults to --timeout")
+    parser.add_argument("--recycle", type=int, default=0,
+                        help="Replace workers after this many jobs")
+    parser.add_argument("--mayapy",
+                        help="Interpreter of workers, defaults to mayapy")
+    parser.add_argument("--snapshot",
+                        help="Restore pipeline from snapshot in workers")
+    parser.add_argument("--report",
+                        help="Write report as JSON to this path")
+    parser.add_argument("--worker", action="store_true",
+                        help=argparse.SUPPRESS)
+
+    args = parser.parse_args(args)
+
+    if args.worker:
+        return _worker(args.snapshot)
+
+    if not args.jobs:
+        parser.error("jobs is required")
+
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.jobs) as f:
+        jobs = json.load(f)
+
+    pool = Pool(workers=args.workers,
+                executable=args.mayapy,
+                snapshot=args.snapshot,
+                timeout=args.timeout,
+                recycle=args.recycle,
+                startup_timeout=args.startup_timeout)
+
+    report = pool.run(jobs)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=4)
+
+    sys.stdout.write(format_report(report) + "\n")
+
+    return 0 if report["succeeded"] == len(jobs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(_cli(sys.argv[1:]))
@@ -0,0 +1,430 @@
+"""Local read-through cache of published files
+
+Published files live under `registered_root()`, typically on network
+storage. When installed, `localize()` returns a copy of a published file
+on local disk, copying it on first use such that subsequent loads, by
+any process on this machine, read locally.
+
+Example:
+    >>> install("/ssd/jiminy-cache", maxsize=100 * GB)
+    >>> localize("//server/projects/hero/publish/rig/v001/rig.ma")
+    '/ssd/jiminy-cache/entries/3f/3f0c.../rig.ma'
+
+A copy is valid as long as the size and modification time of its source
+are unchanged, or, given a checksum, as long as the checksum matches.
+Least recently used copies are removed once the cache exceeds `maxsize`.
+
+Processes sharing a cache coordinate through lock files, such that each
+file is copied once and copies are never removed while in use.
+
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import shutil
+import hashlib
+import logging
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    import msvcrt
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+self = sys.modules[__name__]
+self._root = None
+self._maxsize = None
+self._stats = dict()
+
+GB = 1024 ** 3
+
+MAXSIZE = 50 * GB  # Default size of cache, in bytes
+
+# Copies used this recently are never removed, as their
+# process may not have finished reading them.
+GRACE = 5 * 60
+
+_CHUNK = 1024 * 1024
+
+
+def install(root=None, maxsize=None):
+    """Cache published files in `root`
+
+    Arguments:
+        root (str, optional): Local directory of cache, defaults to
+            $JIMINY_CACHE. The cache remains disabled if neither is set.
+        maxsize (int, optional): Size of cache in bytes, defaults to
+            $JIMINY_CACHE_SIZE in gigabytes, or `MAXSIZE`
+
+    """
+
+    root = root or os.getenv("JIMINY_CACHE")
+    if not root:
+        return
+
+    if maxsize is None:
+        size = os.getenv("JIMINY_CACHE_SIZE")
+        maxsize = int(float(size) * GB) if size else MAXSIZE
+
+    entries = os.path.join(root, "entries")
+    if not os.path.isdir(entries):
+        try:
+            os.makedirs(entries)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    log.info("Caching published files in %s (%.1f GB)"
+             % (root, float(maxsize) / GB))
+
+    self._root = root
+    self._maxsize = maxsize
+    reset_stats()
+
+
+def uninstall():
+    if self._root is not None:
+        log.info(format_stats())
+
+    self._root = None
+    self._maxsize = None
+
+
+def is_installed():
+    return self._root is not None
+
+
+def localize(path, checksum=None):
+    """Return local copy of `path`, copying it if needed
+
+    Returns `path` unchanged if the cache isn't installed, or
+    `path` isn't a file that fits in the cache.
+
+    Arguments:
+        path (str): Absolute path to published file
+        checksum (str, optional): Expected checksum of file, as
+            "<algorithm>:<hexdigest>", e.g. "sha1:2fd4e1c6...". When given,
+            copies are validated by checksum rather than modification time.
+
+    """
+
+    if self._root is None:
+        return path
+
+    try:
+        return _localize(path, checksum)
+    except (IOError, OSError) as e:
+        # The cache must never stand in the way of loading
+        log.warning("Could not cache %s: %s" % (path, e))
+        _count("errors")
+        return path
+
+
+def _localize(path, checksum):
+    path = os.path.normpath(os.path.abspath(path))
+    key = hashlib.sha1(path.encode("utf-8")).hexdigest()
+
+    directory = os.path.join(self._root, "entries", key[:2])
+    entry = os.path.join(directory, key)
+    local = os.path.join(entry, os.path.basename(path))
+    meta = entry + ".json"
+
+    source = None
+    if checksum is None:
+        # Stat source even on a hit, to tell whether it has changed
+        source = os.stat(path)
+
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    with FileLock(entry + ".lock"):
+        current = _read_meta(meta)
+
+        if current is not None and os.path.isfile(local):
+            if checksum is not None:
+                valid = current.get("checksum") == checksum
+            else:
+                valid = (current["size"] == source.st_size and
+                         current["mtime"] == source.st_mtime)
+
+            if valid:
+                # Mark as recently used
+                os.utime(meta, None)
+                _count("hits")
+                _count("bytesServed", current["size"])
+                return local
+
+            _count("stale")
+
+        if source is None:
+            source = os.stat(path)
+
+        if not os.path.isfile(path) or source.st_size > self._maxsize:
+            _count("bypassed")
+            return path
+
+        _count("misses")
+        _make_room(source.st_size)
+
+        if not os.path.isdir(entry):
+            os.makedirs(entry)
+
+        algorithm = checksum.split(":", 1)[0] if checksum else None
+        temp = "%s.%d.tmp" % (local, os.getpid())
+        digest = _copy(path, temp, algorithm)
+
+        if checksum and "%s:%s" % (algorithm, digest) != checksum:
+            os.remove(temp)
+            log.warning("Checksum of %s does not match, not caching" % path)
+            _count("corrupt")
+            return path
+
+        if os.path.exists(local):
+            os.remove(local)
+        os.rename(temp, local)
+
+        _write_meta(meta, {
+            "source": path,
+            "size": source.st_size,
+            "mtime": source.st_mtime,
+            "checksum": checksum,
+        })
+
+        _count("bytesCopied", source.st_size)
+        _count("bytesServed", source.st_size)
+
+    return local
+
+
+def _copy(src, dst, algorithm=None):
+    """Copy `src` to `dst`, returning hexdigest of `algorithm` if given"""
+    if algorithm is None:
+        shutil.copyfile(src, dst)
+        return None
+
+    hasher = hashlib.new(algorithm)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        for chunk in iter(lambda: fsrc.read(_CHUNK), b""):
+            hasher.update(chunk)
+            fdst.write(chunk)
+
+    return hasher.hexdigest()
+
+
+def _read_meta(fname):
+    try:
+        with open(fname) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_meta(fname, data):
+    temp = "%s.%d.tmp" % (fname, os.getpid())
+    with open(temp, "w") as f:
+        json.dump(data, f)
+
+    if os.path.exists(fname):
+        os.remove(fname)
+    os.rename(temp, fname)
+
+
+def _entries():
+    """Yield (last used, size, key path) of each copy in the cache"""
+    entries = os.path.join(self._root, "entries")
+
+    for prefix in os.listdir(entries):
+        directory = os.path.join(entries, prefix)
+        if not os.path.isdir(directory):
+            continue
+
+        for fname in os.listdir(directory):
+            if not fname.endswith(".json"):
+                continue
+
+            meta = os.path.join(directory, fname)
+            try:
+                used = os.stat(meta).st_mtime
+                size = _read_meta(meta)["size"]
+            except (OSError, TypeError, KeyError):
+                continue
+
+            yield used, size, meta[:-len(".json")]
+
+
+def size():
+    """Return total size of cached copies, in bytes"""
+    if self._root is None:
+        return 0
+    return sum(entry[1] for entry in _entries())
+
+
+def _make_room(required):
+    """Remove least recently used copies until `required` bytes fit"""
+    with FileLock(os.path.join(self._root, "evict.lock")):
+        entries = sorted(_entries())
+        total = sum(entry[1] for entry in entries)
+        now = time.time()
+
+        for used, size, entry in entries:
+            if total + required <= self._maxsize:
+                break
+
+            if now - used < GRACE:
+                continue
+
+            lock = FileLock(entry + ".lock", blocking=False)
+            if not lock.acquire():
+                continue  # In use
+
+            try:
+                os.remove(entry + ".json")
+                shutil.rmtree(entry, ignore_errors=True)
+            except OSError:
+                continue
+            finally:
+                lock.release()
+
+            total -= size
+            _count("evictions")
+
+
+def clear():
+    """Remove all copies not currently in use"""
+    if self._root is None:
+        return
+
+    maxsize, self._maxsize = self._maxsize, 0
+    try:
+        _make_room(0)
+    finally:
+        self._maxsize = maxsize
+
+
+def _count(key, amount=1):
+    self._stats[key] = self._stats.get(key, 0) + amount
+
+
+def stats():
+    """Return statistics of this process since `install()`"""
+    result = {
+        "hits": 0,
+        "misses": 0,
+        "stale": 0,
+        "bypassed": 0,
+        "corrupt": 0,
+        "errors": 0,
+        "evictions": 0,
+        "bytesCopied": 0,
+        "bytesServed": 0,
+    }
+
+    result.update(self._stats)
+
+    # Stale copies are counted as misses too
+    requests = result["hits"] + result["misses"]
+    result["hitRate"] = float(result["hits"]) / requests if requests else 0.0
+
+    return result
+
+
+def reset_stats():
+    self._stats.clear()
+
+
+def format_stats():
+    """Return human readable summary of `stats()`"""
+    data = stats()
+    return (
+        "Cache: %(hits)d hits, %(misses)d misses, %(stale)d stale "
+        "(%(rate).0f%% hit rate), %(copied).1f MB copied, "
+        "%(served).1f MB served, %(evictions)d evictions" % {
+            "hits": data["hits"],
+            "misses": data["misses"],
+            "stale": data["stale"],
+            "rate": data["hitRate"] * 100,
+            "copied": data["bytesCopied"] / 1024.0 ** 2,
+            "served": data["bytesServed"] / 1024.0 ** 2,
+            "evictions": data["evictions"],
+        }
+    )
+
+
+class FileLock(object):
+    """Exclusive lock between processes, held via a lock file
+
+    Arguments:
+        path (str): Path to lock file, created if missing
+        blocking (bool, optional): Wait for lock, rather than failing
+
+    """
+
+    def __init__(self, path, blocking=True):
+        self.path = path
+        self.blocking = blocking
+        self._file = None
+
+    def acquire(self):
+        """Acquire lock, returning whether it was acquired"""
+        self._file = open(self.path, "a+")
+        self._file.seek(0)
+        fd = self._file.fileno()
+
+        try:
+            if fcntl is not None:
+                flags = fcntl.LOCK_EX
+                if not self.blocking:
+                    flags |= fcntl.LOCK_NB
+                fcntl.flock(fd, flags)
+
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except IOError:
+                        if not self.blocking:
+                            raise
+                        time.sleep(0.05)
+
+        except (IOError, OSError):
+            self._file.close()
+            self._file = None
+
+            if self.blocking:
+                raise
+
+            return False
+
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+
+        fd = self._file.fileno()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
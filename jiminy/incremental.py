@@ -0,0 +1,294 @@
+"""Incremental publishing of instances unchanged since last published
+
+The fingerprint of an instance is a hash of its imprinted data along
+with the members of its objectSet and their state. Plug-ins decorated
+with `cached` are skipped for instances of which they have already
+processed the current fingerprint, restoring what they added to
+`instance.data` the last time instead.
+
+Example:
+    >>> class ExtractAlembic(pyblish.api.InstancePlugin):
+    ...     order = pyblish.api.ExtractorOrder
+    ...     families = ["jiminy.model"]
+    ...
+    ...     @incremental.cached
+    ...     def process(self, instance):
+    ...         ...
+
+Results are kept next to the scene, in .jiminy/<scene>.json, with
+the last fingerprint of each instance. Extractors benefit only when
+staging to a directory which persists between publishes, as results
+whose `stagingDir` or `files` no longer exist are never reused.
+
+Disable with $JIMINY_INCREMENTAL=0.
+
+"""
+
+import os
+import sys
+import json
+import hashlib
+import functools
+
+from maya import cmds
+
+from . import lib
+
+self = sys.modules[__name__]
+self._sidecar = None  # Path, modification time and contents of sidecar
+
+ENABLED = os.getenv("JIMINY_INCREMENTAL", "1") != "0"
+
+# Attributes contributing to the state of nodes of a type, in addition
+# to keyable and user-defined attributes.
+STATE_ATTRIBUTES = {
+    "file": ("fileTextureName",),
+    "AlembicNode": ("abc_File",),
+    "gpuCache": ("cacheFileName", "cacheGeomPath"),
+    "reference": (),
+}
+
+
+def fingerprint(node):
+    """Return hash of instance `node`, its members and their state
+
+    Arguments:
+        node (str): Name of objectSet of instance
+
+    """
+
+    hasher = hashlib.sha1()
+    _update(hasher, sorted(lib.read(node).items()))
+
+    members = cmds.sets(node, query=True) or list()
+    nodes = set(cmds.ls(members, long=True))
+    nodes.update(cmds.listRelatives(cmds.ls(members, objectsOnly=True),
+                                    allDescendents=True,
+                                    fullPath=True) or list())
+
+    for member in sorted(nodes):
+        _update(hasher, member)
+
+        if "." in member:
+            continue  # Component, the state of its node is included
+
+        node_type = cmds.nodeType(member)
+        _update(hasher, node_type)
+
+        attributes = set(cmds.listAttr(member, keyable=True) or list())
+        attributes.update(cmds.listAttr(member, userDefined=True) or list())
+        attributes.update(STATE_ATTRIBUTES.get(node_type, ()))
+
+        for attr in sorted(attributes):
+            try:
+                value = cmds.getAttr(member + "." + attr)
+            except (RuntimeError, ValueError):
+                continue
+            _update(hasher, (attr, value))
+
+        # Animation, rather than values at the current frame
+        keys = cmds.keyframe(member,
+                             query=True,
+                             timeChange=True,
+                             valueChange=True)
+        if keys:
+            _update(hasher, keys)
+
+        if node_type == "mesh":
+            _update(hasher, cmds.xform(member + ".vtx[*]",
+                                       query=True,
+                                       objectSpace=True,
+                                       translation=True))
+
+    return hasher.hexdigest()
+
+
+def _update(hasher, value):
+    hasher.update(repr(value).encode("utf-8"))
+
+
+def cached(process):
+    """Decorator skipping `process` for instances unchanged since last run
+
+    The wrapper takes exactly `self` and `instance`, as pyblish
+    provides arguments by the names of those of `process`, ignoring
+    `self` alone.
+
+    Arguments:
+        process (callable): InstancePlugin.process, taking `instance`
+
+    """
+
+    @functools.wraps(process)
+    def wrapper(self, instance):
+        plugin = self
+        node = instance.data.get("objectName", instance.name)
+
+        if not ENABLED or not cmds.objExists(node):
+            return process(plugin, instance)
+
+        if "fingerprint" not in instance.data:
+            instance.data["fingerprint"] = fingerprint(node)
+
+        key = _plugin_key(plugin)
+        result = lookup(node, instance.data["fingerprint"], key)
+
+        if result is not None and _outputs_exist(result):
+            plugin.log.info("%s unchanged since last publish, reusing "
+                            "result of %s" % (instance, type(plugin).__name__))
+            instance.data.update(result)
+            instance.data.setdefault("reused", list()).append(key)
+            return
+
+        before = _serialise(instance.data)
+        process(plugin, instance)
+        after = _serialise(instance.data)
+
+        if after is None:
+            return  # Not serialisable, can't be reused
+
+        added = dict(
+            (name, value) for name, value in after.items()
+            if before is None or before.get(name) != value
+        )
+
+        store(node, instance.data["fingerprint"], key, added)
+
+    return wrapper
+
+
+def _plugin_key(plugin):
+    cls = type(plugin)
+    return "%s.%s:%s" % (cls.__module__,
+                         cls.__name__,
+                         getattr(cls, "version", None))
+
+
+def _serialise(data):
+    try:
+        return json.loads(json.dumps(data))
+    except (TypeError, ValueError):
+        return None
+
+
+def _outputs_exist(result):
+    staging = result.get("stagingDir")
+    if staging is None:
+        return True
+
+    if not os.path.isdir(staging):
+        return False
+
+    # Files are either a single file, a list of files or
+    # a list of lists of files, such as image sequences.
+    files = result.get("files") or list()
+    if not isinstance(files, list):
+        files = [files]
+
+    for fname in files:
+        sequence = fname if isinstance(fname, list) else [fname]
+        if not all(os.path.exists(os.path.join(staging, frame))
+                   for frame in sequence):
+            return False
+
+    return True
+
+
+def sidecar():
+    """Return path to file of results of current scene, or None if unsaved"""
+    scene = cmds.file(query=True, sceneName=True)
+    if not scene:
+        return None
+
+    return os.path.join(os.path.dirname(scene),
+                        ".jiminy",
+                        os.path.basename(scene) + ".json")
+
+
+def _read():
+    path = sidecar()
+    if path is None:
+        return None, {}
+
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return path, {}
+
+    if self._sidecar is not None and self._sidecar[:2] == (path, mtime):
+        return path, self._sidecar[2]
+
+    try:
+        with open(path) as f:
+            results = json.load(f)
+    except (IOError, ValueError):
+        results = {}
+
+    self._sidecar = (path, mtime, results)
+    return path, results
+
+
+def lookup(node, fingerprint, key):
+    """Return data added by plug-in `key` to `node` of `fingerprint`"""
+    _, results = _read()
+    instance = results.get(node)
+
+    if instance is None or instance["fingerprint"] != fingerprint:
+        return None
+
+    return instance["results"].get(key)
+
+
+def store(node, fingerprint, key, data):
+    """Remember `data` added by plug-in `key` to `node` of `fingerprint`
+
+    Results of previous fingerprints of `node` are discarded.
+
+    """
+
+    path, results = _read()
+    if path is None:
+        return
+
+    results = dict(results)
+    instance = results.get(node)
+    if instance is None or instance["fingerprint"] != fingerprint:
+        instance = {"fingerprint": fingerprint, "results": {}}
+
+    instance["results"][key] = data
+    instance["time"] = lib.time()
+    results[node] = instance
+
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    temp = "%s.%d.tmp" % (path, os.getpid())
+    with open(temp, "w") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temp, path)
+
+    self._sidecar = (path, os.path.getmtime(path), results)
+
+
+def invalidate(node=None):
+    """Forget results of `node`, defaults to all instances of the scene"""
+    path, results = _read()
+    if path is None or not os.path.exists(path):
+        return
+
+    if node is None:
+        os.remove(path)
+        self._sidecar = None
+        return
+
+    results = dict(results)
+    results.pop(node, None)
+
+    with open(path, "w") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+    self._sidecar = None
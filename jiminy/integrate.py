@@ -0,0 +1,611 @@
+"""Transfer of published files into their final location
+
+Integrator plug-ins of a config hand their files to `integrate()`,
+which copies them concurrently, computing the checksum of each file as
+it is copied, and records sizes and checksums with the version.
+
+Example:
+    >>> results = integrate([
+    ...     ("/tmp/staging/model.abc", "/projects/hero/publish/model.abc"),
+    ...     ("/tmp/staging/model.ma", "/projects/hero/publish/model.ma"),
+    ... ], version=version_id)
+    >>> results["/projects/hero/publish/model.abc"]["checksum"]
+    'sha1:2fd4e1c67a2d28fced849ee1bb76e7391b93eb12'
+
+Each file is first written alongside its destination, then renamed into
+place, such that a file at its destination is always complete.
+
+With deduplication, enabled with $JIMINY_DEDUPE or `dedupe=True`, files
+are stored once by checksum under `registered_root()`/.store, and linked
+to from their destination. Files identical to one already stored, such
+as textures unchanged since the previous version, are never copied.
+
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import shutil
+import hashlib
+import logging
+import threading
+import contextlib
+
+from .vendor import six
+from . import io, cache, pipeline
+
+log = logging.getLogger(__name__)
+
+self = sys.modules[__name__]
+self._hashes = None  # Checksum of sources, by path, size and mtime
+self._hashes_changed = False
+self._hashes_lock = threading.Lock()
+self._store_locks = dict()  # Lock per file of the store, within this process
+
+ALGORITHM = "sha1"  # Of checksums, any supported by hashlib
+
+WORKERS = 4  # Files copied at once
+
+DEDUPE = bool(os.getenv("JIMINY_DEDUPE"))  # Link files from the store
+
+STORE = ".store"  # Directory of content-addressed store, under the root
+
+# Checksums of sources remembered between sessions, on this machine
+CHECKSUMS = os.path.join(os.path.expanduser("~"), ".jiminy", "checksums.json")
+CHECKSUMS_SIZE = 100000  # Checksums remembered, beyond which all are forgotten
+
+_CHUNK = 8 * 1024 * 1024
+
+# Errors of zero-copy system calls which mean they don't apply
+# to this pair of files, such as across file systems.
+_UNSUPPORTED = (
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    getattr(errno, "EOPNOTSUPP", errno.EINVAL),
+    getattr(errno, "ENOTSUP", errno.EINVAL),
+)
+
+
+def copy(src, dst, algorithm=ALGORITHM):
+    """Copy `src` to `dst` atomically, returning its checksum
+
+    With a checksum, the file is read once, hashing each chunk as it is
+    written. Without, the copy is left to the kernel where supported,
+    via `os.copy_file_range` or `os.sendfile`.
+
+    Arguments:
+        src (str): Path to file
+        dst (str): Path to destination, its directory is created if needed
+        algorithm (str, optional): Of checksum, None for no checksum
+
+    Returns:
+        str: Checksum as "<algorithm>:<hexdigest>", or None
+
+    """
+
+    directory = os.path.dirname(dst)
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    temp = "%s.%d.%d.tmp" % (dst,
+                             os.getpid(),
+                             threading.current_thread().ident)
+
+    try:
+        with open(src, "rb") as fsrc, open(temp, "wb") as fdst:
+            if algorithm is None:
+                checksum = None
+                _copy_zero(fsrc, fdst)
+            else:
+                checksum = "%s:%s" % (algorithm, _copy_hash(fsrc,
+                                                            fdst,
+                                                            algorithm))
+        shutil.copymode(src, temp)
+        _replace(temp, dst)
+
+    except Exception:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+    return checksum
+
+
+def _copy_hash(fsrc, fdst, algorithm):
+    """Copy in a single pass over the data, returning its hexdigest"""
+    hasher = hashlib.new(algorithm)
+    buffer = bytearray(_CHUNK)
+    view = memoryview(buffer)
+
+    while True:
+        read = fsrc.readinto(buffer)
+        if not read:
+            break
+
+        # Hashing and writing release the GIL for other transfers
+        hasher.update(view[:read])
+        fdst.write(view[:read])
+
+    return hasher.hexdigest()
+
+
+def _copy_zero(fsrc, fdst):
+    """Copy within the kernel if possible, avoiding user-space buffers"""
+    size = os.fstat(fsrc.fileno()).st_size
+
+    for function in (_copy_file_range, _sendfile):
+        try:
+            if function(fsrc.fileno(), fdst.fileno(), size):
+                return
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+
+            # Nothing has been copied on the first call failing
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+
+    shutil.copyfileobj(fsrc, fdst, _CHUNK)
+
+
+def _copy_file_range(src, dst, size):
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(src, dst, min(size - copied, 1 << 30))
+        if count == 0:
+            break
+        copied += count
+
+    _check_copied(copied, size)
+    return True
+
+
+def _sendfile(src, dst, size):
+    # Only Linux supports sending to a regular file
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        return False
+
+    copied = 0
+    while copied < size:
+        count = os.sendfile(dst, src, copied, min(size - copied, 1 << 30))
+        if count == 0:
+            break
+        copied += count
+
+    _check_copied(copied, size)
+    return True
+
+
+def _check_copied(copied, size):
+    if copied < size:
+        # The source shrank whilst copying
+        raise IOError("Copied %d of %d bytes, source changed" % (copied, size))
+
+
+def _replace(src, dst):
+    if six.PY3:
+        os.replace(src, dst)
+        return
+
+    # Windows won't rename onto an existing file in Python 2
+    if os.name == "nt" and os.path.exists(dst):
+        os.remove(dst)
+    os.rename(src, dst)
+
+
+def checksum_of(path, algorithm=ALGORITHM):
+    """Return checksum of file at `path`
+
+    Checksums are remembered by path, size and modification time, in
+    `CHECKSUMS` on disk, such that unchanged files are only read once.
+
+    """
+
+    stat = os.stat(path)
+    key = "%s|%d|%r|%s" % (os.path.abspath(path),
+                           stat.st_size,
+                           stat.st_mtime,
+                           algorithm)
+
+    with self._hashes_lock:
+        if self._hashes is None:
+            self._hashes = _read_checksums()
+
+        if key in self._hashes:
+            return self._hashes[key]
+
+    hasher = hashlib.new(algorithm)
+    buffer = bytearray(_CHUNK)
+    view = memoryview(buffer)
+
+    with open(path, "rb") as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            hasher.update(view[:read])
+
+    checksum = "%s:%s" % (algorithm, hasher.hexdigest())
+
+    with self._hashes_lock:
+        if len(self._hashes) >= CHECKSUMS_SIZE:
+            self._hashes.clear()
+
+        self._hashes[key] = checksum
+        self._hashes_changed = True
+
+    return checksum
+
+
+def _read_checksums():
+    try:
+        with open(CHECKSUMS) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return dict()
+
+
+def save_checksums():
+    """Write checksums computed this session to `CHECKSUMS`"""
+    with self._hashes_lock:
+        if not self._hashes_changed:
+            return
+
+        hashes = dict(self._hashes)
+        self._hashes_changed = False
+
+    directory = os.path.dirname(CHECKSUMS)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    temp = "%s.%d.tmp" % (CHECKSUMS, os.getpid())
+    with open(temp, "w") as f:
+        json.dump(hashes, f)
+
+    _replace(temp, CHECKSUMS)
+
+
+def store_path(checksum):
+    """Return path to file of `checksum` in the content-addressed store"""
+    algorithm, digest = checksum.split(":", 1)
+    return os.path.join(pipeline.registered_root(),
+                        STORE,
+                        algorithm,
+                        digest[:2],
+                        digest)
+
+
+def link(src, dst):
+    """Link `dst` to `src` atomically, returning how
+
+    Hardlinks are preferred, falling back to symlinks where hardlinks
+    aren't supported, such as across file systems, and lastly a copy.
+
+    Returns:
+        str: "hardlink", "symlink" or "copy"
+
+    """
+
+    directory = os.path.dirname(dst)
+    if directory and not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    temp = "%s.%d.%d.tmp" % (dst,
+                             os.getpid(),
+                             threading.current_thread().ident)
+
+    for method, function in (("hardlink", getattr(os, "link", None)),
+                             ("symlink", getattr(os, "symlink", None))):
+        if function is None:
+            continue
+
+        try:
+            function(src, temp)
+        except (OSError, NotImplementedError):
+            continue
+
+        try:
+            _replace(temp, dst)
+        except OSError:
+            os.remove(temp)
+            raise
+
+        return method
+
+    copy(src, dst, algorithm=None)
+    return "copy"
+
+
+def deduplicate(src, dst, algorithm=ALGORITHM):
+    """Integrate `src` at `dst` via the content-addressed store
+
+    The source is hashed first, which is skipped for files unchanged
+    since last hashed, and only copied if not already in the store.
+    Files of the same checksum are stored one at a time, across threads
+    and processes, such that identical files are only copied once.
+
+    Returns:
+        tuple: Checksum, whether the file was already stored,
+            and how `dst` was linked, see `link()`
+
+    """
+
+    checksum = checksum_of(src, algorithm)
+    stored = store_path(checksum)
+    size = os.path.getsize(src)
+
+    with _store_lock(stored):
+        try:
+            existing = os.path.getsize(stored) == size
+        except OSError:
+            existing = False
+
+        if not existing:
+            copied = copy(src, stored, algorithm)
+
+            if copied != checksum:
+                # Modified whilst publishing
+                os.remove(stored)
+                raise IOError("%s changed during integration" % src)
+
+            # Stored files are shared by every version linking to them
+            os.chmod(stored, 0o444)
+
+    return checksum, existing, link(stored, dst)
+
+
+@contextlib.contextmanager
+def _store_lock(stored):
+    """Hold exclusive access to file `stored` of the store
+
+    Threads are locked out in-process as well, as file locks
+    on network storage are not always honoured.
+
+    """
+
+    with self._hashes_lock:
+        lock = self._store_locks.setdefault(stored, threading.Lock())
+
+    directory = os.path.dirname(stored)
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    with lock, cache.FileLock(stored + ".lock"):
+        yield
+
+
+def integrate(transfers,
+              version=None,
+              workers=None,
+              algorithm=ALGORITHM,
+              dedupe=None):
+    """Copy files of a publish into place, concurrently
+
+    Either all files are integrated or, should any fail, none are.
+    Files are copied next to their destination and only renamed into
+    place once all have been copied, such that files overwritten are
+    left as they were should any fail.
+
+    Arguments:
+        transfers (list): Pairs of source and destination path, or
+            triplets with the id of the representation of the file
+        version (str, optional): Id of version to record `data.files`
+            with, by path relative to `registered_root()`
+        workers (int, optional): Files copied at once, defaults to `WORKERS`
+        algorithm (str, optional): Of checksums, None for no checksums
+        dedupe (bool, optional): Link files from the content-addressed
+            store, defaults to `DEDUPE`. Requires an `algorithm`.
+
+    Returns:
+        dict: Size, checksum and duration of each destination, and
+            with `dedupe` whether it was already stored and how it
+            was linked
+
+    """
+
+    if dedupe is None:
+        dedupe = DEDUPE
+
+    if dedupe and algorithm is None:
+        raise ValueError("Deduplication requires checksums")
+
+    pending = six.moves.queue.Queue()
+    for transfer in transfers:
+        pending.put(transfer)
+
+    results = dict()
+    staging = dict()  # Path copied to, by destination
+    errors = list()
+    lock = threading.Lock()
+    started = time.time()
+
+    def work():
+        while not errors:
+            try:
+                transfer = pending.get_nowait()
+            except six.moves.queue.Empty:
+                return
+
+            src, dst = transfer[:2]
+            begin = time.time()
+
+            staged = _staged(dst)
+            result = dict()
+
+            try:
+                with lock:
+                    staging[dst] = staged
+
+                if dedupe:
+                    checksum, existing, method = deduplicate(src,
+                                                             staged,
+                                                             algorithm)
+                    result["deduplicated"] = existing
+                    result["link"] = method
+                else:
+                    checksum = copy(src, staged, algorithm)
+
+            except Exception as e:
+                with lock:
+                    errors.append((src, dst, e))
+                return
+
+            result.update({
+                "size": os.path.getsize(staged),
+                "checksum": checksum,
+                "duration": time.time() - begin,
+            })
+
+            with lock:
+                results[dst] = result
+
+    threads = [
+        threading.Thread(target=work, name="jiminy-integrate")
+        for _ in range(min(workers or WORKERS, len(transfers)))
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        _discard(staging.values())
+
+        src, dst, error = errors[0]
+        raise IOError("Could not integrate %s to %s: %s" % (src, dst, error))
+
+    _commit(staging)
+
+    duration = time.time() - started
+    total = sum(result["size"] for result in results.values())
+    log.info("Integrated %d files, %.1f MB in %.2fs (%.1f MB/s)" % (
+        len(results),
+        total / 1024.0 ** 2,
+        duration,
+        total / 1024.0 ** 2 / duration if duration else 0))
+
+    if dedupe:
+        save_checksums()
+
+        avoided = sum(result["size"] for result in results.values()
+                      if result["deduplicated"])
+        log.info("Deduplicated %d files, avoided %.1f MB" % (
+            sum(1 for result in results.values() if result["deduplicated"]),
+            avoided / 1024.0 ** 2))
+
+    if version is not None:
+        _record(transfers, results, version)
+
+    return results
+
+
+def _staged(dst):
+    """Return path to which `dst` is copied prior to committing"""
+    return "%s.%d.staged" % (dst, os.getpid())
+
+
+def _discard(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _commit(staging):
+    """Rename staged files into place, all or none
+
+    Files at each destination are kept aside until all are in place,
+    and put back should any rename fail.
+
+    """
+
+    committed = list()
+
+    try:
+        for dst, staged in staging.items():
+            backup = None
+
+            if os.path.exists(dst):
+                backup = "%s.%d.backup" % (dst, os.getpid())
+                _keep(dst, backup)
+
+            committed.append((dst, backup))
+            _replace(staged, dst)
+
+    except Exception:
+        for dst, backup in reversed(committed):
+            try:
+                if backup is not None:
+                    _replace(backup, dst)
+
+                    # Renaming a link onto the same file leaves both
+                    _discard([backup])
+
+                elif os.path.exists(dst):
+                    os.remove(dst)
+            except OSError as e:
+                log.error("Could not restore %s: %s" % (dst, e))
+
+        _discard(staging.values())
+        raise
+
+    _discard(backup for dst, backup in committed if backup is not None)
+
+
+def _keep(path, backup):
+    """Keep `path` at `backup` too, linked where possible"""
+    if os.path.exists(backup):
+        os.remove(backup)
+
+    try:
+        os.link(path, backup)
+    except (AttributeError, OSError):
+        # Absent from its destination until renamed into place
+        _replace(path, backup)
+
+
+def _record(transfers, results, version):
+    """Store size and checksum of each file with its version"""
+    root = pipeline.registered_root()
+
+    files = dict()
+    for dst, result in results.items():
+        path = os.path.relpath(dst, root) if root else dst
+        files[path.replace("\\", "/")] = {
+            "size": result["size"],
+            "checksum": result["checksum"],
+        }
+
+    io.update_many({"type": "version", "_id": version},
+                   {"$set": {"data.files": files}})
+
+    # Checksums of representations validate local copies, see `cache`
+    for transfer in transfers:
+        if len(transfer) > 2 and results[transfer[1]]["checksum"]:
+            io.update_many(
+                {"type": "representation", "_id": transfer[2]},
+                {"$set": {"data.checksum": results[transfer[1]]["checksum"]}}
+            )
@@ -0,0 +1,503 @@
+"""Local metadata store for projects, assets, subsets, versions and representations
+
+Documents are kept in a single SQLite file and queried with a subset of
+the MongoDB query language, such that call sites written for a database
+like that of Avalon work unchanged.
+
+Example:
+    >>> install(":memory:")
+    >>> project = insert_one({"type": "project", "name": "hero"})
+    >>> asset = insert_one({"type": "asset", "name": "boy", "parent": project})
+    >>> [doc["name"] for doc in find({"type": "asset", "parent": project})]
+    ['boy']
+    >>> uninstall()
+
+Queries on `type` along with `name` or `parent`, or on `_id`, are index
+lookups. Remaining conditions are evaluated on the documents found.
+Queries projecting, filtering and sorting on indexed keys alone, such
+as the names of all assets, are answered from the index without
+reading the documents themselves.
+
+"""
+
+import os
+import re
+import sys
+import json
+import uuid
+import sqlite3
+import threading
+
+from .vendor import six
+
+self = sys.modules[__name__]
+self._connection = None
+self._lock = threading.RLock()
+
+# Columns holding these keys of each document, and indexed
+INDEXED = ("_id", "type", "name", "parent")
+
+# Keep below SQLite's limit on number of variables per statement
+_CHUNK = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    _id TEXT PRIMARY KEY,
+    type TEXT,
+    name TEXT,
+    parent TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_type_name ON documents (type, name);
+CREATE INDEX IF NOT EXISTS documents_type_parent ON documents (type, parent);
+"""
+
+
+def install(path=None):
+    """Open store at `path`, creating it if needed
+
+    Arguments:
+        path (str, optional): Path to database file, defaults to
+            $JIMINY_DB or ~/.jiminy/jiminy.db
+
+    """
+
+    if self._connection is not None:
+        return
+
+    path = path or os.environ.get("JIMINY_DB") or os.path.join(
+        os.path.expanduser("~"), ".jiminy", "jiminy.db")
+
+    directory = os.path.dirname(path)
+    if path != ":memory:" and directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.executescript(_SCHEMA)
+    self._connection = connection
+
+
+def uninstall():
+    if self._connection is not None:
+        self._connection.close()
+    self._connection = None
+
+
+def _cursor():
+    if self._connection is None:
+        raise IOError("Store not installed, call io.install()")
+    return self._connection
+
+
+def projects():
+    """Yield all projects"""
+    for project in find({"type": "project"}):
+        yield project
+
+
+def insert_one(document):
+    """Insert `document`, returning its `_id`"""
+    return insert_many([document])[0]
+
+
+def insert_many(documents):
+    """Insert each of `documents`, returning their `_id`"""
+    ids = list()
+    rows = list()
+
+    for document in documents:
+        document = dict(document)
+        document.setdefault("_id", uuid.uuid4().hex)
+        ids.append(document["_id"])
+        rows.append(_row(document))
+
+    with self._lock:
+        connection = _cursor()
+        with connection:
+            connection.executemany(
+                "INSERT INTO documents VALUES (?, ?, ?, ?, ?)", rows)
+
+    return ids
+
+
+def find(filter=None, projection=None, sort=None):
+    """Return documents matching `filter`
+
+    Arguments:
+        filter (dict, optional): MongoDB-style query, supporting
+            equality, $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte,
+            $exists, $regex with $options, $and, $or and $nor
+        projection (dict, optional): Keys to include, e.g. {"name": 1},
+            or exclude, e.g. {"data": 0}
+        sort (list, optional): Pairs of key and 1 or -1 for direction
+
+    Returns:
+        list of documents
+
+    """
+
+    filter = filter or {}
+    columns = _columns(filter, projection, sort)
+
+    if columns is not None and _pushed_down(filter):
+        documents = list(_select(filter, columns))
+    else:
+        documents = [
+            document for document in _select(filter, columns)
+            if _match(document, filter)
+        ]
+
+    for key, direction in reversed(sort or []):
+        documents.sort(key=lambda document: _lookup(document, key)[0],
+                       reverse=direction < 0)
+
+    if columns is not None:
+        # Flat keys only, no need for `_project()`
+        keys = [key for key in columns if projection.get(key, key == "_id")]
+        documents = [
+            dict((key, document[key]) for key in keys if key in document)
+            for document in documents
+        ]
+
+    elif projection:
+        documents = [_project(document, projection)
+                     for document in documents]
+
+    return documents
+
+
+def find_one(filter=None, projection=None, sort=None):
+    """Return first document matching `filter`, or None"""
+    documents = find(filter, projection, sort)
+    return documents[0] if documents else None
+
+
+def update_many(filter, update):
+    """Apply `update` to documents matching `filter`
+
+    Arguments:
+        filter (dict): MongoDB-style query, see `find()`
+        update (dict): Keys to {"$set": ...} and {"$unset": ...}
+
+    Returns:
+        int: Number of documents updated
+
+    """
+
+    unsupported = set(update) - set(["$set", "$unset"])
+    if unsupported:
+        raise ValueError("Unsupported update: %s" % ", ".join(unsupported))
+
+    with self._lock:
+        documents = find(filter)
+        for document in documents:
+            for key, value in update.get("$set", {}).items():
+                _assign(document, key, value)
+            for key in update.get("$unset", {}):
+                _assign(document, key, None, remove=True)
+
+        connection = _cursor()
+        with connection:
+            connection.executemany(
+                "REPLACE INTO documents VALUES (?, ?, ?, ?, ?)",
+                [_row(document) for document in documents])
+
+    return len(documents)
+
+
+def delete_many(filter):
+    """Remove documents matching `filter`, returning how many"""
+    with self._lock:
+        ids = [document["_id"] for document in find(filter)]
+
+        connection = _cursor()
+        with connection:
+            for chunk in _chunks(ids):
+                connection.execute(
+                    "DELETE FROM documents WHERE _id IN (%s)"
+                    % ", ".join("?" * len(chunk)), chunk)
+
+    return len(ids)
+
+
+def _row(document):
+    return tuple(
+        _column(document.get(key)) for key in INDEXED
+    ) + (json.dumps(document),)
+
+
+def _column(value):
+    """Return value as stored in an indexed column"""
+    if value is None or isinstance(value, (six.string_types, int, float)):
+        return value
+    return json.dumps(value, sort_keys=True)
+
+
+def _chunks(values):
+    values = list(values)
+    for index in range(0, len(values), _CHUNK):
+        yield values[index:index + _CHUNK]
+
+
+def _columns(filter, projection, sort):
+    """Return indexed keys sufficient to answer a query, or None
+
+    Indexed keys hold plain values, such as strings, of which None
+    stands for missing. Queries distinguishing the two, or involving
+    other keys, require the full document.
+
+    """
+
+    if not projection or not all(
+        value or key == "_id" for key, value in projection.items()
+    ):
+        return None
+
+    keys = set(projection) | set(filter) | set(key for key, _ in sort or [])
+    if not keys.issubset(INDEXED):
+        return None
+
+    for condition in filter.values():
+        operands = list(condition.items()) if isinstance(condition, dict) \
+            else [(None, condition)]
+
+        for operator, operand in operands:
+            if operator == "$exists" or operand is None or \
+                    isinstance(operand, dict):
+                return None
+
+    return ["_id"] + sorted(keys - set(["_id"]))
+
+
+def _pushed_down(filter):
+    """Return whether `_select()` matches `filter` entirely in SQL"""
+    in_conditions = 0
+
+    for key, condition in filter.items():
+        if key not in INDEXED:
+            return False
+
+        if isinstance(condition, dict):
+            if set(condition) == set(["$in"]):
+                in_conditions += 1
+                continue
+
+            if set(condition) != set(["$eq"]):
+                return False
+
+            condition = condition["$eq"]
+
+        if isinstance(condition, (dict, list)):
+            return False
+
+    # Only one $in condition is pushed down
+    return in_conditions <= 1
+
+
+def _select(filter, columns=None):
+    """Yield documents which may match `filter`, using indexes
+
+    Only conditions on indexed keys are pushed down to SQL, which
+    may return more documents than match the full `filter`.
+
+    Arguments:
+        filter (dict): MongoDB-style query, see `find()`
+        columns (list, optional): Read only these indexed keys of
+            each document, rather than the whole document
+
+    """
+
+    clauses = list()
+    arguments = list()
+    candidates = None  # Values of an $in condition, queried in chunks
+    candidate_key = None
+
+    for key in INDEXED:
+        if key not in filter:
+            continue
+
+        condition = filter[key]
+
+        if isinstance(condition, dict):
+            if set(condition) == set(["$eq"]):
+                condition = condition["$eq"]
+
+            elif set(condition) == set(["$in"]) and candidates is None:
+                candidates = [_column(value) for value in condition["$in"]]
+                candidate_key = key
+                continue
+
+            else:
+                continue
+
+        if isinstance(condition, (dict, list)):
+            continue
+
+        clauses.append("%s = ?" % key)
+        arguments.append(_column(condition))
+
+    def query(extra_clauses, extra_arguments):
+        where = " AND ".join(clauses + extra_clauses)
+        sql = "SELECT %s FROM documents" % (
+            ", ".join(columns) if columns else "document")
+        if where:
+            sql += " WHERE " + where
+
+        with self._lock:
+            rows = _cursor().execute(
+                sql, arguments + extra_arguments).fetchall()
+
+        if columns:
+            for row in rows:
+                yield dict(
+                    (key, value) for key, value in zip(columns, row)
+                    if value is not None
+                )
+            return
+
+        for (document,) in rows:
+            yield json.loads(document)
+
+    if candidates is None:
+        for document in query([], []):
+            yield document
+        return
+
+    for chunk in _chunks(candidates):
+        clause = "%s IN (%s)" % (candidate_key, ", ".join("?" * len(chunk)))
+        for document in query([clause], chunk):
+            yield document
+
+
+_missing = object()
+
+
+def _lookup(document, key):
+    """Return value of dotted `key` in `document`, and whether it exists"""
+    value = document
+    for part in key.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and \
+                int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None, False
+    return value, True
+
+
+def _assign(document, key, value, remove=False):
+    parts = key.split(".")
+    for part in parts[:-1]:
+        document = document.setdefault(part, {})
+
+    if remove:
+        document.pop(parts[-1], None)
+    else:
+        document[parts[-1]] = value
+
+
+def _match(document, filter):
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(_match(document, sub) for sub in condition):
+                return False
+
+        elif key == "$or":
+            if not any(_match(document, sub) for sub in condition):
+                return False
+
+        elif key == "$nor":
+            if any(_match(document, sub) for sub in condition):
+                return False
+
+        else:
+            value, exists = _lookup(document, key)
+            if not _match_value(value, exists, condition):
+                return False
+
+    return True
+
+
+def _equals(value, operand):
+    if isinstance(value, list) and not isinstance(operand, list):
+        return operand in value
+    return value == operand
+
+
+def _compare(value, operand, function):
+    try:
+        return value is not None and function(value, operand)
+    except TypeError:
+        return False
+
+
+_operators = {
+    "$eq": lambda value, operand: _equals(value, operand),
+    "$ne": lambda value, operand: not _equals(value, operand),
+    "$in": lambda value, operand: any(_equals(value, o) for o in operand),
+    "$nin": lambda value, operand: not any(
+        _equals(value, o) for o in operand),
+    "$gt": lambda value, operand: _compare(value, operand,
+                                           lambda a, b: a > b),
+    "$gte": lambda value, operand: _compare(value, operand,
+                                            lambda a, b: a >= b),
+    "$lt": lambda value, operand: _compare(value, operand,
+                                           lambda a, b: a < b),
+    "$lte": lambda value, operand: _compare(value, operand,
+                                            lambda a, b: a <= b),
+}
+
+
+def _match_value(value, exists, condition):
+    is_operator = (
+        isinstance(condition, dict) and
+        condition and
+        all(key.startswith("$") for key in condition)
+    )
+
+    if not is_operator:
+        return exists and _equals(value, condition)
+
+    for operator, operand in condition.items():
+        if operator == "$options":
+            continue
+
+        if operator == "$exists":
+            if bool(operand) != exists:
+                return False
+
+        elif operator == "$regex":
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") \
+                else 0
+            if not isinstance(value, six.string_types) or \
+                    not re.search(operand, value, flags):
+                return False
+
+        elif operator in _operators:
+            if not _operators[operator](value, operand):
+                return False
+
+        else:
+            raise ValueError("Unsupported operator: %s" % operator)
+
+    return True
+
+
+def _project(document, projection):
+    include = [key for key, value in projection.items() if value]
+    exclude = [key for key, value in projection.items() if not value]
+
+    if include:
+        result = {"_id": document["_id"]}
+        for key in include:
+            value, exists = _lookup(document, key)
+            if exists:
+                _assign(result, key, value)
+    else:
+        result = json.loads(json.dumps(document))
+
+    for key in exclude:
+        _assign(result, key, None, remove=True)
+
+    return result
@@ -1,13 +1,39 @@
+import os
+import sys
+import copy
+import json
 import logging
+import threading
 import contextlib
 import datetime
 
-from maya import cmds
+from maya import cmds, mel
+
+from .vendor import six
+
+try:
+    from logging.handlers import QueueHandler as _QueueHandler, QueueListener
+except ImportError:
+    # Python 2
+    _QueueHandler = logging.Handler
+    QueueListener = None
 
 
 log_ = logging.getLogger(__name__)
 logger = log_
 
+self = sys.modules[__name__]
+self._logging = None  # Logger, listener and prior state, once installed
+self._bulk = None  # Calls deferred until the outermost bulk operation exits
+
+_formatter = logging.Formatter()  # Of tracebacks, see `QueueHandler`
+
+LOG_QUEUE_SIZE = 10000  # Records beyond this are dropped, never waited on
+
+# Repeated warnings beyond this many per period are suppressed
+LOG_RATE_LIMIT = 5
+LOG_RATE_PERIOD = 60.0
+
 __all__ = [
     "time",
     "log",
@@ -47,6 +73,278 @@ def log(cls):
     return cls
 
 
+class QueueHandler(_QueueHandler):
+    """Hand records to a listener thread, with their message resolved
+
+    Messages and tracebacks are resolved on the logging thread, as
+    their arguments, such as Maya objects, may only be safe to turn
+    into strings there. Only handlers run on the listener, such that
+    slow handlers don't delay the logging thread.
+
+    """
+
+    def __init__(self, queue):
+        logging.Handler.__init__(self)
+        self.queue = queue
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Return copy of `record` with its message resolved
+
+        As `logging.handlers.QueueHandler.prepare()` of Python 3,
+        except the record is left to handlers to format.
+
+        """
+
+        message = record.getMessage()
+
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = _formatter.formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except six.moves.queue.Full:
+            self.dropped += 1
+
+
+class _Listener(object):
+    """Stand-in for logging.handlers.QueueListener of Python 3"""
+
+    def __init__(self, queue, *handlers, **kwargs):
+        self.queue = queue
+        self.handlers = handlers
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._monitor,
+                                        name="jiminy-logging")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _monitor(self):
+        for record in iter(self.queue.get, None):
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def stop(self):
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+
+class RateLimitFilter(logging.Filter):
+    """Suppress warnings repeated more than `limit` times per `period`
+
+    Warnings are the same when their messages, arguments included, are.
+    Once the period of a warning with some suppressed is over, a summary
+    of how many were suppressed is passed to `summarise`.
+
+    Arguments:
+        limit (int, optional): Warnings let through per period
+        period (float, optional): Seconds
+        summarise (callable, optional): Called with a record summarising
+            those suppressed, such as `Handler.emit` of the handler
+            filtered
+
+    """
+
+    def __init__(self,
+                 limit=LOG_RATE_LIMIT,
+                 period=LOG_RATE_PERIOD,
+                 summarise=None):
+        logging.Filter.__init__(self)
+        self.limit = limit
+        self.period = period
+        self.summarise = summarise
+        self._windows = dict()  # Start, count and suppressed, by message
+        self._swept = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.created - self._swept > 1.0:
+            self._sweep(record.created)
+
+        if record.levelno < logging.WARNING:
+            return True
+
+        try:
+            message = record.getMessage()
+        except Exception:
+            message = str(record.msg)
+
+        key = (record.name, record.levelno, message)
+
+        with self._lock:
+            window = self._windows.get(key)
+
+            if window is None or record.created - window[0] > self.period:
+                self._windows[key] = [record.created, 1, 0]
+                expired = window
+            else:
+                expired = None
+                window[1] += 1
+
+                if window[1] > self.limit:
+                    window[2] += 1
+                    return False
+
+        if expired is not None:
+            self._summarise(key, expired)
+
+        return True
+
+    def _sweep(self, now):
+        """Summarise and forget warnings of which the period is over"""
+        with self._lock:
+            self._swept = now
+            expired = [
+                (key, self._windows.pop(key))
+                for key, window in list(self._windows.items())
+                if now - window[0] > self.period
+            ]
+
+        for key, window in expired:
+            self._summarise(key, window)
+
+    def _summarise(self, key, window):
+        if not window[2] or self.summarise is None:
+            return
+
+        name, level, message = key
+        self.summarise(logging.makeLogRecord({
+            "name": name,
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+            "msg": "%d similar messages suppressed in %gs: %s",
+            "args": (window[2], self.period, message),
+        }))
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line
+
+    Mappings passed via `extra={"data": {...}}` are included.
+
+    Example:
+        >>> log = logging.getLogger("jiminy")
+        >>> log.info("Created %s", "modelDefault",
+        ...          extra={"data": {"family": "jiminy.model"}})
+
+    """
+
+    def format(self, record):
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "name": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+
+        data.update(getattr(record, "data", None) or {})
+
+        return json.dumps(data, default=str)
+
+
+class _MainThreadHandler(logging.Handler):
+    """Hand records to `handler` in batches, on Maya's main thread
+
+    For handlers writing to Maya's GUI, which may only
+    be used from the main thread.
+
+    """
+
+    def __init__(self, handler):
+        logging.Handler.__init__(self, handler.level)
+        self.handler = handler
+        self._pending = list()
+        self._lock = threading.Lock()
+
+    def emit(self, record):
+        with self._lock:
+            schedule = not self._pending
+            self._pending.append(record)
+
+        if schedule:
+            import maya.utils
+            maya.utils.executeDeferred(self.flush)
+
+    def flush(self):
+        with self._lock:
+            records, self._pending = self._pending, list()
+
+        for record in records:
+            self.handler.handle(record)
+
+
+def install_logging(name="jiminy"):
+    """Handle records of logger `name` and its children on a thread
+
+    Handlers of the root logger, such as Maya's Script Editor, are
+    called from a listener thread rather than the thread logging.
+    Set $JIMINY_LOG_FILE to also write records as JSON to a file.
+
+    """
+
+    if self._logging is not None:
+        return
+
+    handlers = list()
+    for handler in logging.getLogger().handlers:
+        if type(handler).__module__.startswith("maya"):
+            handler = _MainThreadHandler(handler)
+        handlers.append(handler)
+
+    if os.getenv("JIMINY_LOG_FILE"):
+        handler = logging.FileHandler(os.environ["JIMINY_LOG_FILE"])
+        handler.setFormatter(JsonFormatter())
+        handlers.append(handler)
+
+    queue = six.moves.queue.Queue(LOG_QUEUE_SIZE)
+
+    handler = QueueHandler(queue)
+    handler.addFilter(RateLimitFilter(summarise=handler.emit))
+
+    if QueueListener is not None:
+        listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    else:
+        listener = _Listener(queue, *handlers)
+    listener.start()
+
+    logger = logging.getLogger(name)
+    self._logging = (logger, listener, logger.handlers[:], logger.propagate)
+
+    logger.handlers = [handler]
+    logger.propagate = False
+
+
+def uninstall_logging():
+    """Restore synchronous logging, after handling pending records"""
+    if self._logging is None:
+        return
+
+    logger, listener, handlers, propagate = self._logging
+    self._logging = None
+
+    logger.handlers = handlers
+    logger.propagate = propagate
+    listener.stop()
+
+
 @contextlib.contextmanager
 def without_extension():
     """Use cmds.file with defaultExtensions=False"""
@@ -73,6 +371,11 @@ def maintained_selection():
 
     """
 
+    if self._bulk is not None:
+        # Restored once, on exiting the bulk operation
+        yield
+        return
+
     previous_selection = cmds.ls(selection=True)
     try:
         yield
@@ -86,6 +389,132 @@ def maintained_selection():
                         noExpand=True)
 
 
+@contextlib.contextmanager
+def bulk_operation():
+    """Perform many scene operations as one
+
+    Within this context the viewport isn't refreshed, every change is
+    undone in one go, selection is captured and restored once rather
+    than by each operation, and calls to `defer()`, such as events
+    emitted, are made on exit rather than as they happen.
+
+    Nested operations are part of the outermost one.
+
+    Example:
+        >>> with bulk_operation():
+        ...     for index in range(1000):
+        ...         node = cmds.createNode("transform")
+        ...         imprint(node, {"index": index})
+
+    """
+
+    if self._bulk is not None:
+        yield
+        return
+
+    self._bulk = list()
+    previous_selection = None
+    suspended = False
+    chunk = False
+
+    try:
+        previous_selection = cmds.ls(selection=True)
+
+        if not cmds.refresh(query=True, suspend=True):
+            cmds.refresh(suspend=True)
+            suspended = True
+
+        cmds.undoInfo(openChunk=True)
+        chunk = True
+
+        yield
+
+    finally:
+        deferred, self._bulk = self._bulk, None
+
+        try:
+            if chunk:
+                cmds.undoInfo(closeChunk=True)
+
+            if suspended:
+                cmds.refresh(suspend=False)
+
+            if previous_selection:
+                cmds.select(previous_selection,
+                            replace=True,
+                            noExpand=True)
+            elif previous_selection is not None:
+                cmds.select(deselect=True,
+                            noExpand=True)
+
+        finally:
+            for function, args in deferred:
+                try:
+                    function(*args)
+                except Exception:
+                    log_.warning("Deferred call to %s failed", function,
+                                 exc_info=True)
+
+
+def in_bulk_operation():
+    """Return whether a bulk operation is in progress"""
+    return self._bulk is not None
+
+
+def defer(function, *args):
+    """Call `function` on exiting the current bulk operation
+
+    Returns:
+        bool: Whether the call was deferred, False outside
+            of bulk operations where nothing is done
+
+    """
+
+    if self._bulk is None:
+        return False
+
+    self._bulk.append((function, args))
+    return True
+
+
+def lsattr(attr, value=None):
+    """Return nodes with attribute `attr`, optionally of `value`
+
+    Arguments:
+        attr (str): Name of attribute
+        value (object, optional): Only return nodes where
+            `attr` is of this value
+
+    """
+
+    nodes = cmds.ls("*." + attr,
+                    recursive=True,
+                    objectsOnly=True,
+                    long=True) or list()
+
+    if value is None:
+        return nodes
+
+    return [
+        node for node in nodes
+        if cmds.getAttr(node + "." + attr) == value
+    ]
+
+
+def read(node):
+    """Return user-defined attributes of `node` as a dictionary"""
+    data = dict()
+
+    for attr in cmds.listAttr(node, userDefined=True) or list():
+        try:
+            data[attr] = cmds.getAttr(node + "." + attr)
+        except (RuntimeError, ValueError):
+            # Attributes without a value, such as messages
+            continue
+
+    return data
+
+
 def imprint(node, data):
     """Write `data` to `node` as userDefined attributes
 
@@ -109,6 +538,10 @@ def imprint(node, data):
 
     """
 
+    # Attributes are added and set by one MEL script, rather than
+    # two commands per attribute, each a round trip from Python
+    script = list()
+
     for key, value in data.items():
 
         if callable(value):
@@ -116,19 +549,39 @@ def imprint(node, data):
             value = value()
 
         if isinstance(value, bool):
-            add_type = {"attributeType": "bool"}
-            set_type = {"keyable": False, "channelBox": True}
-        elif isinstance(value, basestring):
-            add_type = {"dataType": "string"}
-            set_type = {"type": "string"}
-        elif isinstance(value, int):
-            add_type = {"attributeType": "long"}
-            set_type = {"keyable": False, "channelBox": True}
+            add_type = "-attributeType bool"
+            set_type = "-keyable false -channelBox true"
+            value = "true" if value else "false"
+        elif isinstance(value, six.string_types):
+            add_type = "-dataType \"string\""
+            set_type = "-type \"string\""
+            value = _mel_string(value)
+        elif isinstance(value, six.integer_types):
+            add_type = "-attributeType long"
+            set_type = "-keyable false -channelBox true"
+            value = str(value)
         elif isinstance(value, float):
-            add_type = {"attributeType": "double"}
-            set_type = {"keyable": False, "channelBox": True}
+            add_type = "-attributeType double"
+            set_type = "-keyable false -channelBox true"
+            value = repr(value)
         else:
             raise TypeError("Unsupported type: %r" % type(value))
 
-        cmds.addAttr(node, longName=key, **add_type)
-        cmds.setAttr(node + "." + key, value, **set_type)
+        script.append("addAttr -longName %s %s %s;" % (
+            _mel_string(key), add_type, _mel_string(node)))
+        script.append("setAttr %s %s %s;" % (
+            set_type, _mel_string(node + "." + key), value))
+
+    if script:
+        mel.eval("\n".join(script))
+
+
+def _mel_string(value):
+    """Return `value` as a quoted MEL string"""
+    return "\"%s\"" % (
+        value.replace("\\", "\\\\")
+             .replace("\"", "\\\"")
+             .replace("\n", "\\n")
+             .replace("\r", "\\r")
+             .replace("\t", "\\t")
+    )
@@ -1,18 +1,27 @@
 import os
 import sys
+import ast
+import json
+import time
 import types
+import marshal
+import hashlib
 import logging
+import fnmatch
 import inspect
 import weakref
-import traceback
 import importlib
 
 from maya import cmds, OpenMaya
 from pyblish import api as pyblish
-from .vendor.Qt import QtCore, QtWidgets
+from .vendor.Qt import QtCore
 
 from . import (
     lib,
+    cache,
+    widgets,
+    profiling,
+    recording,
 
     Session,
 
@@ -32,34 +41,307 @@ self = sys.modules[__name__]
 self._menu = "jiminymaya"  # Unique name of menu
 self._events = dict()  # Registered Maya callbacks
 self._parent = None  # Main Window
+self._descriptions = dict()  # Statically parsed plug-in files, by path
+self._plugin_modules = dict()  # Executed plug-in modules, by path
+self._superseded = weakref.WeakSet()  # Classes of released plug-in modules
+self._compiled = dict()  # Compiled plug-in code restored from a snapshot
+self._install_duration = None  # Seconds spent in last `install()`
+self._loader_index = None  # Loaders by family and representation
+self._baseline = None  # State prior to installing a config
+self._config_changes = None  # What the config registered when installing
+self._config_mtimes = dict()  # Source modification time of config modules
+
+PLUGIN_NAMESPACE = "jiminy._plugins"  # Parent of executed plug-in modules
+
+MANIFEST = "manifest.json"  # Pre-generated description of plug-ins
+
+LOADER_RESCAN = 30.0  # Seconds between checks of loader files on disk
+
+# Class attributes read from plug-ins without executing them
+PLUGIN_ATTRIBUTES = (
+    "name",
+    "label",
+    "family",
+    "icon",
+    "families",
+    "representations",
+    "order",
+)
 
 IS_HEADLESS = not hasattr(cmds, "about") or cmds.about(batch=True)
 
+CONTAINER_ID = "pyblish.jiminy.container"  # Identifies loaded containers
+INSTANCE_ID = "pyblish.jiminy.instance"  # Identifies instances to publish
+
+_missing = object()
+
 
 def install():
+    started = time.time()
+    _install_host()
+
     log.info("Jiminy Cricket, at your service.")
 
+    pyblish.register_host("maya")
+
+    config = find_config()
+    self._baseline = _capture_baseline()
+    _install_config(config)
+    register_config(config)
+
+    _install_services()
+
+    self._install_duration = time.time() - started
+
+
+def _install_host():
+    """Install what precedes the config, by `install()` and `restore_state()`
+
+    The environment is expected to be resolved, as recording starts
+    with $JIMINY_RECORD.
+
+    """
+
+    lib.install_logging()
+
+    if os.getenv("JIMINY_RECORD"):
+        recording.start(os.environ["JIMINY_RECORD"])
+
     _register_callbacks()
 
     if not IS_HEADLESS:
         _install_menu()
 
-    pyblish.register_host("maya")
+    pyblish.register_callback("published", _on_published)
 
-    config = find_config()
-    config.install()
+
+def _install_services():
+    """Install what follows the config, by `install()` and `restore_state()`"""
+    cache.install()
+
+    if os.getenv("JIMINY_PREFETCH"):
+        from . import prefetch
+        prefetch.install()
+
+    if not IS_HEADLESS:
+        from . import tracking
+        tracking.install()
+
+
+# Environment variables resolved by the entry script and configs
+SNAPSHOT_ENVIRONMENT = ("JIMINY_", "PYBLISH_", "AVALON_", "PYTHONPATH")
+SNAPSHOT_VERSION = 2
+
+# Environment variables of the process restoring, never of the snapshot
+PROCESS_ENVIRONMENT = ("JIMINY_RECORD",)
+
+
+def snapshot_state(fname):
+    """Write the state of an installed pipeline to `fname`
+
+    Captures what `install()` and the entry script resolve, such as
+    the environment, `sys.path`, registered root, Session, plug-in
+    paths and the config in use, along with the discovery index and
+    compiled code of each plug-in. Restore with `restore_state()`.
+
+    Plug-in files which fail to compile are left out, as they are
+    by discovery.
+
+    The file is specific to the running version of Python.
+
+    Arguments:
+        fname (str): Path to snapshot file
+
+    """
+
+    config = registered_config()
+    assert config is not None, "Pipeline not installed"
+
+    plugin_paths = dict()
+    descriptions = dict()
+    compiled = dict()
+
+    for superclass, paths in _registered_plugin_paths.items():
+        key = "%s.%s" % (superclass.__module__, superclass.__name__)
+        plugin_paths[key] = list(paths)
+
+        for path in paths:
+            for _, abspath in _plugin_files(path):
+                stat = os.stat(abspath)
+
+                try:
+                    with open(abspath) as f:
+                        code = compile(f.read(), abspath, "exec")
+                except (SyntaxError, ValueError, TypeError) as e:
+                    log.warning("Skipped: \"%s\" (%s)", abspath, e)
+                    continue
+
+                compiled[abspath] = (stat.st_mtime, stat.st_size, code)
+                descriptions[abspath] = (
+                    stat.st_mtime,
+                    _describe_plugin_file(abspath)
+                )
+
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "python": list(sys.version_info[:3]),
+        "installDuration": self._install_duration,
+        "environment": dict(
+            (key, value) for key, value in os.environ.items()
+            if key.startswith(SNAPSHOT_ENVIRONMENT)
+        ),
+        "sysPath": list(sys.path),
+        "root": _registered_root["_"],
+        "session": dict(Session),
+        "config": config.__name__,
+        "pluginPaths": plugin_paths,
+        "pyblishPaths": list(pyblish.registered_paths()),
+        "pyblishHosts": list(pyblish.registered_hosts()),
+        "descriptions": descriptions,
+        "compiled": compiled,
+        "baseline": _serialise_baseline(self._baseline),
+    }
+
+    try:
+        data = marshal.dumps(state)
+    except ValueError as e:
+        raise ValueError("Could not serialise state, "
+                         "the Session may only hold plain data: %s" % e)
+
+    temp = "%s.%d.tmp" % (fname, os.getpid())
+    with open(temp, "wb") as f:
+        f.write(data)
+
+    if os.path.exists(fname):
+        os.remove(fname)
+    os.rename(temp, fname)
+
+    log.info("Wrote pipeline snapshot to %s" % fname)
+
+
+def restore_state(fname):
+    """Install pipeline from snapshot written by `snapshot_state()`
+
+    An alternative to `install()` for workers sharing the state of
+    the process which wrote the snapshot, such as farm tasks of one
+    job. Plug-ins are neither parsed nor compiled again, but the config
+    is installed as usual, on top of the state prior to its install in
+    the snapshot, such that its event handlers, pyblish callbacks and
+    individually registered plug-ins are as they were.
+
+    Arguments:
+        fname (str): Path to snapshot file
+
+    Raises:
+        ValueError on snapshot of another version, or from another
+            version of Python
+
+    Returns:
+        float: Seconds taken to restore
+
+    """
+
+    started = time.time()
+
+    with open(fname, "rb") as f:
+        data = f.read()
+
+    try:
+        state = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        raise ValueError("%s is not a snapshot of this "
+                         "version of Python" % fname)
+
+    if state.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("Unsupported snapshot version: %s"
+                         % state.get("version"))
+
+    if list(state["python"]) != list(sys.version_info[:3]):
+        raise ValueError("Snapshot written by Python %s" % ".".join(
+            str(part) for part in state["python"]))
+
+    baseline = state["baseline"]
+    os.environ.update(
+        (key, value) for key, value in baseline["environment"].items()
+        if key not in PROCESS_ENVIRONMENT
+    )
+
+    for path in reversed(state["sysPath"]):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    _install_host()
+
+    for host in state["pyblishHosts"]:
+        pyblish.register_host(host)
+
+    for path in state["pyblishPaths"]:
+        pyblish.register_plugin_path(path)
+
+    # As registered by the entry script, prior to the config
+    if baseline["root"] is not None:
+        register_root(baseline["root"])
+
+    Session.update(baseline["session"])
+
+    for key, paths in baseline["pluginPaths"].items():
+        for path in paths:
+            register_plugin_path(_superclass_of(key), path)
+
+    self._descriptions.update(state["descriptions"])
+    self._compiled.update(state["compiled"])
+
+    config = importlib.import_module(state["config"])
+    self._baseline = _capture_baseline()
+    _install_config(config)
     register_config(config)
 
+    paths = dict(
+        ("%s.%s" % (superclass.__module__, superclass.__name__), list(paths))
+        for superclass, paths in _registered_plugin_paths.items()
+    )
+
+    if paths != state["pluginPaths"] or \
+            _registered_root["_"] != state["root"]:
+        log.warning("%s registered other plug-in paths or root than when "
+                    "snapshot, plug-ins are discovered anew", config.__name__)
+
+    _install_services()
+
+    duration = time.time() - started
+    log.info("Restored pipeline from %s in %.3fs" % (fname, duration))
+
+    if state["installDuration"] is not None:
+        log.info("Saved %.3fs over installing" % (
+            state["installDuration"] - duration))
+
+    return duration
+
 
 def uninstall():
     log.info("Farewell, my friend.")
     config = registered_config()
     config.uninstall()
     deregister_config()
+    _uninstall_config()
+
+    pyblish.deregister_callback("published", _on_published)
+
+    cache.uninstall()
+
+    if os.getenv("JIMINY_PREFETCH"):
+        from . import prefetch
+        prefetch.uninstall()
 
     if not IS_HEADLESS:
+        from . import tracking
+        tracking.uninstall()
+
         _uninstall_menu()
 
+    recording.stop()
+    lib.uninstall_logging()
+
 
 def find_config():
     log.info("Finding configuration for project..")
@@ -70,15 +352,262 @@ def find_config():
         raise EnvironmentError("No configuration found.")
 
     log.info("Found %s, loading.." % config)
-    return importlib.import_module(config)
+    return _import_config(config)
+
+
+def switch_config(name, session=None):
+    """Uninstall the current config and install config `name` in its place
+
+    Only what configs are responsible for is swapped, such as plug-in
+    paths, root, Session and environment. Everything else stays as is,
+    including callbacks, menu, windows and caches of discovered plug-ins
+    and icons, making this far quicker than restarting Maya.
+
+    Modules of `name` which have changed on disk since imported are
+    reloaded. Should the new config fail to install, the previous
+    config is reinstalled before raising.
+
+    Arguments:
+        name (str): Name of config module, e.g. "jiminy_dress_hero"
+        session (dict, optional): Update `Session` with this,
+            prior to installing the config
+
+    """
+
+    previous = registered_config()
+    assert previous is not None, "Pipeline not installed"
+
+    started = time.time()
+
+    previous.uninstall()
+    deregister_config()
+    _uninstall_config()
+
+    os.environ["JIMINY_DRESS"] = name
+    Session.update(session or {})
+
+    try:
+        config = _import_config(name)
+        _install_config(config)
+
+    except Exception:
+        log.warning("Could not install %s, reinstalling %s",
+                    name, previous.__name__, exc_info=True)
+
+        _uninstall_config()
+        os.environ["JIMINY_DRESS"] = previous.__name__
+        _install_config(previous)
+        register_config(previous)
+        raise
+
+    register_config(config)
+
+    log.info("Switched from %s to %s in %.2fs",
+             previous.__name__, name, time.time() - started)
+
+    emit("config_changed", [config])
+    return config
+
+
+def _install_config(config):
+    """Install `config`, remembering what it registers
+
+    Plug-ins, plug-in paths, root, Session and environment registered
+    while installing are remembered, along with event handlers defined
+    in the package of `config`. Handlers of other modules, such as
+    those of jiminy modules first imported by the config, are not the
+    config's to remove. See `_uninstall_config()`.
+
+    """
+
+    before = _capture_baseline()
+    handlers = _registered_event_handlers.snapshot()
+
+    try:
+        config.install()
+    finally:
+        changes = _changes(before, _capture_baseline())
+        changes["handlers"] = dict(
+            (event, [ref for ref in refs
+                     if ref not in handlers.get(event, ()) and
+                     _defined_in(ref(), config.__name__)])
+            for event, refs in _registered_event_handlers.items()
+        )
+
+        self._config_changes = changes
+
+
+def _defined_in(callback, package):
+    module = getattr(callback, "__module__", None) or ""
+    return module == package or module.startswith(package + ".")
+
+
+def _changes(before, after):
+    """Return what was registered between baselines `before` and `after`"""
+    changes = dict()
+
+    for key in ("plugins", "pluginPaths"):
+        changes[key] = dict(
+            (superclass, [item for item in items
+                          if item not in before[key].get(superclass, ())])
+            for superclass, items in after[key].items()
+        )
+
+    # Previous and current values of whatever changed
+    for key in ("root", "session", "environment"):
+        changes[key] = dict(
+            (name, (before[key].get(name, _missing), value))
+            for name, value in after[key].items()
+            if before[key].get(name, _missing) != value
+        )
+
+        changes[key].update(
+            (name, (value, _missing))
+            for name, value in before[key].items()
+            if name not in after[key]
+        )
+
+    return changes
+
+
+def _uninstall_config():
+    """Undo what the config registered, see `_install_config()`
+
+    Only what the config registered is undone, and only where still as
+    the config left it. Whatever was registered by anything else,
+    before or since, is kept.
+
+    """
+
+    changes, self._config_changes = self._config_changes, None
+
+    if changes is None:
+        # Not installed
+        return
+
+    for event, refs in changes["handlers"].items():
+        for ref in refs:
+            callback = ref()
+            if callback is not None:
+                off(event, callback)
+
+    for superclass, plugins in changes["plugins"].items():
+        for plugin in plugins:
+            deregister_plugin(superclass, plugin)
+
+    for superclass, paths in changes["pluginPaths"].items():
+        for path in paths:
+            deregister_plugin_path(superclass, path)
+
+    for name, (previous, value) in changes["root"].items():
+        if _registered_root.get(name, _missing) == value:
+            if previous is _missing:
+                _registered_root.pop(name, None)
+            else:
+                _registered_root.set(name, previous)
+
+    for mapping, key in ((Session, "session"), (os.environ, "environment")):
+        for name, (previous, value) in changes[key].items():
+            if mapping.get(name, _missing) != value:
+                continue  # Changed since
+
+            if previous is _missing:
+                mapping.pop(name, None)
+            else:
+                mapping[name] = previous
+
+
+def _capture_baseline():
+    """Return state, prior to a config installing itself"""
+    return {
+        "plugins": _registered_plugins.snapshot(),
+        "pluginPaths": _registered_plugin_paths.snapshot(),
+        "root": _registered_root.snapshot(),
+        "session": dict(Session),
+        "environment": dict(
+            (key, value) for key, value in os.environ.items()
+            if key.startswith(SNAPSHOT_ENVIRONMENT)
+        ),
+    }
+
+
+def _serialise_baseline(baseline):
+    """Return `baseline` as plain data, less individual plug-ins"""
+    return {
+        "pluginPaths": dict(
+            ("%s.%s" % (superclass.__module__, superclass.__name__),
+             list(paths))
+            for superclass, paths in baseline["pluginPaths"].items()
+        ),
+        "root": baseline["root"].get("_"),
+        "session": baseline["session"],
+        "environment": baseline["environment"],
+    }
+
+
+def _superclass_of(key):
+    """Return superclass of "module.name" `key`, as in a snapshot"""
+    module, name = key.rsplit(".", 1)
+    return getattr(importlib.import_module(module), name)
+
+
+def _source_mtime(module):
+    fname = getattr(module, "__file__", None)
+    if not fname:
+        return None
+
+    if fname.endswith((".pyc", ".pyo")):
+        fname = fname[:-1]
+
+    try:
+        return os.path.getmtime(fname)
+    except OSError:
+        return None
+
+
+def _import_config(name):
+    """Import config `name`, reloading its modules changed since imported
+
+    Submodules are reloaded before their parents, such that parents
+    bind the reloaded submodules.
+
+    """
+
+    modules = sorted(
+        (module_name for module_name, module in sys.modules.items()
+         if module is not None and (module_name == name or
+                                    module_name.startswith(name + "."))),
+        key=lambda module_name: module_name.count("."),
+        reverse=True,
+    )
+
+    for module_name in modules:
+        module = sys.modules[module_name]
+        mtime = _source_mtime(module)
+
+        if mtime is not None and \
+                self._config_mtimes.get(module_name, mtime) != mtime:
+            log.info("Reloading changed %s", module_name)
+            six.moves.reload_module(module)
+
+        self._config_mtimes[module_name] = mtime
+
+    config = importlib.import_module(name)
+
+    for module_name, module in list(sys.modules.items()):
+        if module is not None and module_name not in self._config_mtimes and \
+                (module_name == name or module_name.startswith(name + ".")):
+            self._config_mtimes[module_name] = _source_mtime(module)
+
+    return config
 
 
 def register_config(config):
-    _registered_config["_"] = config
+    _registered_config.set("_", config)
 
 
 def deregister_config():
-    _registered_config["_"] = None
+    _registered_config.set("_", None)
 
 
 def registered_config():
@@ -95,16 +624,14 @@ def _install_menu():
 
     _uninstall_menu()
 
-    self._parent = {
-        widget.objectName(): widget
-        for widget in QtWidgets.QApplication.topLevelWidgets()
-    }["MayaWindow"]
+    self._parent = widgets.main_window()
 
     def deferred():
-        cmds.menu(self._menu,
-                  label="Pipeline",
-                  tearOff=True,
-                  parent="MayaWindow")
+        menu = cmds.menu(self._menu,
+                         label="Pipeline",
+                         tearOff=True,
+                         parent="MayaWindow")
+        widgets.register(self._menu, menu)
         """
         cmds.menuItem("Create...",
                       command=lambda *args: creator.show(parent=self._parent))
@@ -124,13 +651,12 @@ def _install_menu():
 
 
 def _uninstall_menu():
-    app = QtWidgets.QApplication.instance()
-    widgets = dict((w.objectName(), w) for w in app.allWidgets())
-    menu = widgets.get(self._menu)
+    if widgets.delete(self._menu):
+        return
 
-    if menu:
-        menu.deleteLater()
-        del(menu)
+    # Created before the handle was registered, e.g. prior to a reload
+    if cmds.menu(self._menu, exists=True):
+        cmds.deleteUI(self._menu, menu=True)
 
 
 def create(name, asset, family, options=None, data=None):
@@ -161,22 +687,31 @@ def create(name, asset, family, options=None, data=None):
 
     """
     plugins = list()
-    for Plugin in discover(Creator):
+    for Plugin in discover_manifest(Creator):
         has_family = family == Plugin.family
 
         if not has_family:
             continue
 
+        # Only plug-ins of this family are executed
+        Plugin = load_plugin(Plugin)
+        if Plugin is None:
+            continue
+
         Plugin.log.info(
-            "Creating '%s' with '%s'" % (name, Plugin.__name__)
+            "Creating '%s' with '%s'", name, Plugin.__name__,
+            extra={"data": {"subset": name,
+                            "asset": asset,
+                            "family": family}}
         )
 
         try:
-            plugin = Plugin(name, asset, options, data)
+            with profiling.measure("Creator.process", Plugin.__name__):
+                plugin = Plugin(name, asset, options, data)
 
-            with lib.maintained_selection():
-                print("Running %s" % plugin)
-                instance = plugin.process()
+                with lib.maintained_selection():
+                    print("Running %s" % plugin)
+                    instance = plugin.process()
         except Exception as e:
             log.warning(e)
             continue
@@ -187,6 +722,60 @@ def create(name, asset, family, options=None, data=None):
     return instance
 
 
+def create_many(instances):
+    """Create each of `instances` as one bulk operation
+
+    The viewport is refreshed, selection restored and events emitted
+    once for all instances, rather than once per instance, and all of
+    them are undone together.
+
+    Arguments:
+        instances (list): Keyword arguments to `create()` per instance
+
+    Returns:
+        list: Name of each instance
+
+    """
+
+    with lib.bulk_operation():
+        return [create(**instance) for instance in instances]
+
+
+def ls():
+    """Yield containers loaded into the current scene
+
+    Containers are objectSets with an `id` of `CONTAINER_ID`,
+    imprinted with at least the `representation` loaded.
+
+    """
+
+    for node in sorted(lib.lsattr("id", CONTAINER_ID)):
+        data = lib.read(node)
+        data["objectName"] = node
+        yield data
+
+
+def get_representation_path(context):
+    """Return path to published file of representation in `context`
+
+    Arguments:
+        context (dict): avalon-core:context-1.0
+
+    """
+
+    template = context["project"]["config"]["template"]["publish"]
+
+    data = {
+        key: value["name"]
+        for key, value in context.items()
+    }
+
+    data["root"] = registered_root()
+    data["silo"] = context["asset"]["silo"]
+
+    return template.format(**data)
+
+
 @lib.log
 class Loader(list):
     """Load representation into host application
@@ -196,6 +785,13 @@ class Loader(list):
         name (str, optional): Use pre-defined name
         namespace (str, optional): Use pre-defined namespace
 
+    `fname` is the published file. Loaders only reading the file whilst
+    loading, such as by import, may set `cached` to True for `fname` to
+    be a local copy when the cache is installed, see :mod:`cache`, with
+    the published path in `source`. Loaders referring to the file after
+    loading, such as by reference, must not, as local copies are neither
+    seen by other machines nor kept once evicted.
+
     .. versionadded:: 4.0
        This class was introduced
 
@@ -204,20 +800,38 @@ class Loader(list):
     families = list()
     representations = list()
     order = 0
+    cached = False
 
     def __init__(self, context):
-        template = context["project"]["config"]["template"]["publish"]
+        if profiling.is_enabled():
+            for method in ("load", "update", "remove"):
+                setattr(self, method, profiling.wrap(getattr(self, method),
+                                                     "Loader." + method,
+                                                     type(self).__name__))
+
+        fname = get_representation_path(context)
+        self.source = fname
+        self.fname = fname
 
-        data = {
-            key: value["name"]
-            for key, value in context.items()
-        }
+        if self.cached:
+            representation = context.get("representation") or {}
+            checksum = representation.get("data", {}).get("checksum")
+            self.fname = cache.localize(fname, checksum)
 
-        data["root"] = registered_root()
-        data["silo"] = context["asset"]["silo"]
+    @classmethod
+    def prefetch(cls, contexts):
+        """Read publishes of `contexts` in the background, ahead of loading
 
-        fname = template.format(**data)
-        self.fname = fname
+        Arguments:
+            contexts (list): avalon-core:context-1.0 of each representation
+
+        Returns:
+            int: Number of files queued
+
+        """
+
+        from . import prefetch
+        return prefetch.prefetch_contexts(contexts, localize=cls.cached)
 
     def load(self, context, name=None, namespace=None, data=None):
         """Load asset via database
@@ -273,7 +887,7 @@ class Creator(object):
 
         # Default data
         self.data = dict({
-            "id": "pyblish.jiminy.instance",
+            "id": INSTANCE_ID,
             "family": self.family,
             "asset": asset,
             "subset": name,
@@ -295,45 +909,272 @@ class Creator(object):
 def discover(superclass):
     """Find and return subclasses of `superclass`"""
 
-    registered = _registered_plugins.get(superclass, list())
+    registered = _registered_plugins.get(superclass, ())
     plugins = dict()
 
+    _release_missing_modules()
+
     # Include plug-ins from registered paths
-    for path in _registered_plugin_paths.get(superclass, list()):
+    for path in _registered_plugin_paths.get(superclass, ()):
         path = os.path.normpath(path)
 
         assert os.path.isdir(path), "%s is not a directory" % path
 
-        for fname in os.listdir(path):
-            # Ignore files which start with underscore
-            if fname.startswith("_"):
+        for fname, abspath in _plugin_files(path):
+            module = _load_module(abspath)
+            if module is None:
                 continue
 
-            mod_name, mod_ext = os.path.splitext(fname)
-            if not mod_ext == ".py":
-                continue
+            for plugin in plugin_from_module(superclass, module):
+                if plugin.__name__ in plugins:
+                    print("Duplicate plug-in found: %s", plugin)
+                    continue
 
-            abspath = os.path.join(path, fname)
-            if not os.path.isfile(abspath):
-                continue
+                plugins[plugin.__name__] = plugin
 
-            module = types.ModuleType(mod_name)
-            module.__file__ = abspath
+    for plugin in registered:
+        if plugin.__name__ in plugins:
+            print("Warning: Overwriting %s" % plugin.__name__)
+        plugins[plugin.__name__] = plugin
 
-            try:
+    return sorted(plugins.values(), key=lambda Plugin: Plugin.__name__)
+
+
+def _plugin_files(path):
+    """Yield file name and absolute path of each plug-in file in `path`"""
+    for fname in os.listdir(path):
+        # Ignore files which start with underscore
+        if fname.startswith("_"):
+            continue
+
+        mod_name, mod_ext = os.path.splitext(fname)
+        if not mod_ext == ".py":
+            continue
+
+        abspath = os.path.join(path, fname)
+        if not os.path.isfile(abspath):
+            continue
+
+        yield fname, abspath
+
+
+def _load_module(abspath):
+    """Execute plug-in file at `abspath`, returning None on failure
+
+    Each file is executed into a module of its own under
+    `PLUGIN_NAMESPACE`, which is reused until the file changes.
+    A module superseded by a newer version of its file is released.
+
+    """
+
+    stat = os.stat(abspath)
+    signature = (stat.st_mtime, stat.st_size)
+
+    loaded = self._plugin_modules.get(abspath)
+    if loaded is not None and loaded[0] == signature:
+        return loaded[1]
+
+    mod_name = _plugin_module_name(abspath)
+
+    module = types.ModuleType(mod_name)
+    module.__file__ = abspath
+
+    try:
+        compiled = self._compiled.pop(abspath, None)
+        with profiling.measure("module", abspath):
+            if compiled is not None and compiled[:2] == signature:
+                six.exec_(compiled[2], module.__dict__)
+            else:
                 with open(abspath) as f:
                     six.exec_(f.read(), module.__dict__)
 
-                # Store reference to original module, to avoid
-                # garbage collection from collecting it's global
-                # imports, such as `import os`.
-                sys.modules[mod_name] = module
+    except Exception as err:
+        log.warning("Skipped: \"%s\" (%s)", abspath, err)
+        _release_module(abspath)
+        return None
 
-            except Exception as err:
-                print("Skipped: \"%s\" (%s)", mod_name, err)
-                continue
+    _release_module(abspath)
 
-            for plugin in plugin_from_module(superclass, module):
+    # Store reference to original module, to avoid
+    # garbage collection from collecting it's global
+    # imports, such as `import os`.
+    sys.modules[mod_name] = module
+    self._plugin_modules[abspath] = (signature, module)
+
+    return module
+
+
+def _plugin_module_name(abspath):
+    """Return name of module for plug-in file at `abspath`
+
+    Files of the same name in different directories are kept
+    apart, and never collide with importable modules.
+
+    """
+
+    dirname, fname = os.path.split(os.path.normcase(abspath))
+
+    # Paths of Python 2 may already be bytes, of any encoding
+    if isinstance(dirname, six.text_type):
+        dirname = dirname.encode("utf-8")
+
+    digest = hashlib.md5(dirname).hexdigest()[:8]
+    return "%s.%s.%s" % (PLUGIN_NAMESPACE,
+                         digest,
+                         os.path.splitext(fname)[0])
+
+
+def _plugin_classes(module):
+    return [
+        obj for obj in vars(module).values()
+        if inspect.isclass(obj) and obj.__module__ == module.__name__
+    ]
+
+
+def _release_module(abspath):
+    """Forget module executed from `abspath`, if any"""
+    signature, module = self._plugin_modules.pop(abspath, (None, None))
+    if module is None:
+        return
+
+    if sys.modules.get(module.__name__) is module:
+        sys.modules.pop(module.__name__)
+
+    # Keep track of whether anything holds on to them
+    for cls in _plugin_classes(module):
+        self._superseded.add(cls)
+
+
+def _release_missing_modules():
+    """Release modules of plug-in files which no longer exist"""
+    for abspath in list(self._plugin_modules):
+        if not os.path.isfile(abspath):
+            _release_module(abspath)
+
+
+def plugin_memory_report():
+    """Return counts and approximate size of executed plug-in modules
+
+    Sizes are shallow; that of each module's and class' members,
+    excluding whatever they in turn refer to.
+
+    Returns:
+        dict: "modules", "classes" and "size" in bytes of live
+            modules, "superseded" classes of released modules that
+            are still referenced elsewhere, and per-module "files".
+
+    """
+
+    files = list()
+    for abspath, (signature, module) in sorted(self._plugin_modules.items()):
+        classes = _plugin_classes(module)
+        size = sys.getsizeof(module.__dict__) + sum(
+            sys.getsizeof(value) for value in vars(module).values()
+        ) + sum(
+            sys.getsizeof(value)
+            for cls in classes
+            for value in vars(cls).values()
+        )
+
+        files.append({
+            "path": abspath,
+            "module": module.__name__,
+            "classes": len(classes),
+            "size": size,
+        })
+
+    return {
+        "modules": len(files),
+        "classes": sum(entry["classes"] for entry in files),
+        "size": sum(entry["size"] for entry in files),
+        "superseded": len(self._superseded),
+        "files": files,
+    }
+
+
+class PluginManifest(object):
+    """Plug-in described without executing its module
+
+    Carries the class attributes of a plug-in, such as `family`,
+    `label` and `icon`, along with its docstring, as read from its
+    source. Attributes not declared by the plug-in are those of its
+    superclass. The actual class is returned by `load()`.
+
+    """
+
+    def __init__(self, superclass, name, path, attributes, doc=None):
+        self.superclass = superclass
+        self.path = path
+        self.__name__ = name
+        self.__doc__ = doc
+        self.__dict__.update(attributes)
+        self._plugin = None
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.superclass, attr)
+
+    def __repr__(self):
+        return "<PluginManifest %s from %s>" % (self.__name__, self.path)
+
+    def load(self):
+        """Execute module of plug-in and return its class"""
+        if self._plugin is None:
+            module = _load_module(self.path)
+            if module is None:
+                return None
+
+            for plugin in plugin_from_module(self.superclass, module):
+                if plugin.__name__ == self.__name__:
+                    self._plugin = plugin
+                    break
+
+        return self._plugin
+
+
+def load_plugin(plugin):
+    """Return actual class of `plugin`, which may be a `PluginManifest`"""
+    if isinstance(plugin, PluginManifest):
+        return plugin.load()
+    return plugin
+
+
+def discover_manifest(superclass):
+    """Find plug-ins of `superclass` without executing their modules
+
+    Like `discover()`, except plug-ins from registered paths are returned
+    as `PluginManifest`, read from a `MANIFEST` file next to them or
+    parsed from their source. Modules are only executed on `load()`, or
+    right away if any of their classes can't be described statically.
+
+    """
+
+    registered = _registered_plugins.get(superclass, ())
+    plugins = dict()
+
+    for path in _registered_plugin_paths.get(superclass, ()):
+        path = os.path.normpath(path)
+
+        assert os.path.isdir(path), "%s is not a directory" % path
+
+        manifest = _read_manifest(path)
+
+        for fname, abspath in _plugin_files(path):
+            found = _plugins_from_description(
+                superclass,
+                abspath,
+                _describe_plugin_file(abspath, manifest.get(fname))
+            )
+
+            if found is None:
+                module = _load_module(abspath)
+                if module is None:
+                    continue
+
+                found = plugin_from_module(superclass, module)
+
+            for plugin in found:
                 if plugin.__name__ in plugins:
                     print("Duplicate plug-in found: %s", plugin)
                     continue
@@ -348,6 +1189,457 @@ def discover(superclass):
     return sorted(plugins.values(), key=lambda Plugin: Plugin.__name__)
 
 
+class LoaderIndex(object):
+    """Loaders by the family and representation they are compatible with
+
+    Loaders listing a pattern, such as "*" or "jiminy.*", among their
+    `families` or `representations` are matched using `fnmatch`.
+
+    Arguments:
+        loaders (list): Loader classes or `PluginManifest`s
+
+    """
+
+    def __init__(self, loaders):
+        self._exact = dict()
+        self._patterns = list()  # Loaders with any pattern
+        self._memo = dict()
+
+        for loader in loaders:
+            families = list(loader.families or ())
+            representations = list(loader.representations or ())
+
+            if any(_is_pattern(name) for name in
+                   families + representations):
+                self._patterns.append(loader)
+                continue
+
+            for family in families:
+                for representation in representations:
+                    key = (family, representation)
+                    self._exact.setdefault(key, list()).append(loader)
+
+    def query(self, family, representation):
+        """Return loaders compatible with `family` and `representation`
+
+        Sorted by `order`, then name.
+
+        Arguments:
+            family (str or list): Family, or families of which any
+                is compatible, as of a version with multiple families
+            representation (str): Name of representation
+
+        """
+
+        families = (family,) if isinstance(family, six.string_types) \
+            else tuple(family)
+
+        key = (families, representation)
+        if key in self._memo:
+            return self._memo[key]
+
+        loaders = set()
+        for family in families:
+            loaders.update(self._exact.get((family, representation), ()))
+
+        for loader in self._patterns:
+            if _matches_any(families, loader.families) and \
+                    _matches_any([representation], loader.representations):
+                loaders.add(loader)
+
+        result = tuple(sorted(
+            loaders, key=lambda loader: (loader.order, loader.__name__)
+        ))
+
+        self._memo[key] = result
+        return result
+
+
+def _is_pattern(name):
+    return any(character in name for character in "*?[")
+
+
+def _matches_any(names, patterns):
+    return any(
+        fnmatch.fnmatchcase(name, pattern)
+        for name in names
+        for pattern in patterns or ()
+    )
+
+
+def _loader_signature():
+    """Return what the set of registered loaders depends on"""
+    return (_registered_plugins.version, _registered_plugin_paths.version)
+
+
+def _loader_files():
+    """Return path, modification time and size of each loader file"""
+    files = list()
+    for path in _registered_plugin_paths.get(Loader, ()):
+        for _, abspath in _plugin_files(os.path.normpath(path)):
+            stat = os.stat(abspath)
+            files.append((abspath, stat.st_mtime, stat.st_size))
+
+    return tuple(files)
+
+
+def loader_index(refresh=False):
+    """Return index of discovered loaders, rebuilt as loaders change
+
+    Loaders are discovered via `discover_manifest()`, leaving their
+    modules unexecuted until loaded with `load_plugin()`.
+
+    Registering loaders or paths rebuilds the index right away. Files of
+    loaders changed on disk are noticed within `LOADER_RESCAN` seconds,
+    or on `refresh`, as checking them takes a while on network storage.
+
+    Arguments:
+        refresh (bool, optional): Check files of loaders now
+
+    """
+
+    signature = _loader_signature()
+    now = time.time()
+
+    if self._loader_index is not None and \
+            self._loader_index["signature"] == signature:
+
+        if not refresh and \
+                now - self._loader_index["checked"] < LOADER_RESCAN:
+            return self._loader_index["index"]
+
+        files = _loader_files()
+        self._loader_index["checked"] = now
+
+        if files == self._loader_index["files"]:
+            return self._loader_index["index"]
+
+    else:
+        files = _loader_files()
+
+    self._loader_index = {
+        "signature": signature,
+        "files": files,
+        "checked": now,
+        "index": LoaderIndex(discover_manifest(Loader)),
+    }
+
+    return self._loader_index["index"]
+
+
+def compatible_loaders(family, representation):
+    """Return loaders compatible with `family` and `representation`
+
+    Arguments:
+        family (str or list): Family or families, see `LoaderIndex.query()`
+        representation (str): Name of representation
+
+    """
+
+    return loader_index().query(family, representation)
+
+
+def compatible_loaders_many(items):
+    """Return compatible loaders of each of `items`
+
+    Like `compatible_loaders()` for many representations at once,
+    such as every row of a browser, checking for changed loaders once.
+
+    Arguments:
+        items (list): Pairs of family, or families, and representation
+
+    Returns:
+        list: Tuple of loaders of each item
+
+    """
+
+    index = loader_index()
+    return [index.query(family, representation)
+            for family, representation in items]
+
+
+def write_manifest(path):
+    """Write description of every plug-in file in `path` to `MANIFEST`
+
+    Files of which plug-ins can't be described from source alone, such
+    as those deriving from a studio base class in another module, are
+    executed once here and described by their final class attributes,
+    such that discovery from the manifest never executes them.
+
+    Arguments:
+        path (str): Directory of plug-ins
+
+    Returns:
+        Path to written manifest
+
+    """
+
+    manifest = dict()
+    for fname, abspath in _plugin_files(path):
+        classes = _describe_plugin_file(abspath)
+
+        if not _is_static(classes):
+            # Resolved once here, such that discovery never has to
+            classes = _resolve_plugin_file(abspath) or classes
+
+        manifest[fname] = {
+            "mtime": os.path.getmtime(abspath),
+            "classes": classes,
+        }
+
+    fname = os.path.join(path, MANIFEST)
+    with open(fname, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+    return fname
+
+
+def _plugin_superclasses():
+    """Return names of superclasses plug-ins are discovered by"""
+    return set([Creator.__name__, Loader.__name__]) | set(
+        superclass.__name__ for superclass in _registered_plugin_paths.keys()
+    )
+
+
+def _is_static(classes):
+    """Return whether `classes` are fully described by their source"""
+    if classes is None:
+        return False
+
+    superclasses = _plugin_superclasses()
+
+    return not any(
+        description["dynamic"] or any(
+            base not in superclasses for base in description["external"]
+        )
+        for description in classes
+    )
+
+
+def _resolve_plugin_file(abspath):
+    """Return description of plug-ins of `abspath` by executing it
+
+    Plug-ins are described by their final class attributes, inherited
+    from wherever, such that a manifest of them is complete. Returns
+    None should the file fail to execute.
+
+    """
+
+    loaded = abspath in self._plugin_modules
+    module = _load_module(abspath)
+    if module is None:
+        return None
+
+    superclasses = _plugin_superclasses()
+    classes = list()
+
+    for name in sorted(dir(module)):
+        obj = getattr(module, name)
+
+        if not inspect.isclass(obj) or obj.__name__ in superclasses:
+            continue
+
+        bases = [base.__name__ for base in inspect.getmro(obj)[1:]]
+        if not superclasses.intersection(bases):
+            continue
+
+        attributes = dict()
+        dynamic = list()
+
+        for key in PLUGIN_ATTRIBUTES:
+            if not hasattr(obj, key):
+                continue
+
+            value = getattr(obj, key)
+
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                dynamic.append(key)
+            else:
+                attributes[key] = value
+
+        doc = vars(obj).get("__doc__")
+
+        classes.append({
+            "name": obj.__name__,
+            "bases": bases,
+            "external": [],
+            "attributes": attributes,
+            "dynamic": dynamic,
+            "doc": inspect.cleandoc(doc) if doc else None,
+        })
+
+    if not loaded:
+        _release_module(abspath)
+
+    return classes
+
+
+def _read_manifest(path):
+    fname = os.path.join(path, MANIFEST)
+    if not os.path.isfile(fname):
+        return dict()
+
+    try:
+        with open(fname) as f:
+            return json.load(f)
+    except ValueError as e:
+        log.warning("Ignoring malformed manifest %s: %s" % (fname, e))
+        return dict()
+
+
+def _describe_plugin_file(abspath, entry=None):
+    """Return description of each class in plug-in file at `abspath`
+
+    Classes are parsed from source, unless `entry` from a manifest is
+    up to date. None is returned for files which cannot be parsed.
+
+    """
+
+    mtime = os.path.getmtime(abspath)
+
+    if entry is not None and entry.get("mtime") == mtime:
+        return entry["classes"]
+
+    cached = self._descriptions.get(abspath)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(abspath) as f:
+            tree = ast.parse(f.read(), abspath)
+    except (SyntaxError, ValueError, TypeError):
+        classes = None
+    else:
+        classes = _describe_classes(tree)
+
+    self._descriptions[abspath] = (mtime, classes)
+    return classes
+
+
+def _describe_classes(tree):
+    """Return description of top-level classes of parsed module `tree`"""
+
+    builtins = set(dir(six.moves.builtins))
+    local = dict()
+    classes = list()
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        bases = list()
+        external = list()
+        attributes = dict()
+        dynamic = list()
+
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                name = base.id
+            elif isinstance(base, ast.Attribute):
+                name = base.attr
+            else:
+                name = None
+
+            if name in local:
+                # Inherit what was found for a base in the same file
+                bases.append(name)
+                bases.extend(local[name]["bases"])
+                external.extend(local[name]["external"])
+                attributes.update(local[name]["attributes"])
+                dynamic.extend(local[name]["dynamic"])
+            elif name is None:
+                external.append(None)
+            else:
+                bases.append(name)
+                if name not in builtins:
+                    external.append(name)
+
+        for stmt in node.body:
+            if not isinstance(stmt, ast.Assign):
+                continue
+
+            for target in stmt.targets:
+                if not isinstance(target, ast.Name):
+                    continue
+
+                try:
+                    attributes[target.id] = ast.literal_eval(stmt.value)
+                except ValueError:
+                    attributes.pop(target.id, None)
+                    dynamic.append(target.id)
+                else:
+                    if target.id in dynamic:
+                        dynamic.remove(target.id)
+
+        description = {
+            "name": node.name,
+            "bases": bases,
+            "external": external,
+            "attributes": dict(
+                (key, value) for key, value in attributes.items()
+                if key in PLUGIN_ATTRIBUTES
+            ),
+            "dynamic": [key for key in dynamic if key in PLUGIN_ATTRIBUTES],
+            "doc": ast.get_docstring(node),
+        }
+
+        local[node.name] = description
+        classes.append(description)
+
+    return classes
+
+
+def _plugins_from_description(superclass, abspath, classes):
+    """Return `PluginManifest` of each plug-in described in `classes`
+
+    Returns None when the description is insufficient, such as when a
+    class has bases from other modules that may or may not derive from
+    `superclass`, or declares attributes which aren't literals.
+
+    """
+
+    if classes is None:
+        return None
+
+    # Bases of plug-ins of other kinds, such as a Loader found among
+    # Creators, are known not to derive from `superclass`
+    superclasses = _plugin_superclasses() - set([superclass.__name__])
+
+    plugins = list()
+    for description in classes:
+        external = [
+            base for base in description["external"]
+            if base != superclass.__name__
+        ]
+
+        if external and superclass.__name__ not in description["bases"] \
+                and all(base in superclasses for base in external):
+            continue
+
+        # Bases from elsewhere may well derive from `superclass`,
+        # or declare attributes of their own
+        if external:
+            return None
+
+        if superclass.__name__ not in description["bases"]:
+            continue
+
+        if description["dynamic"]:
+            return None
+
+        plugins.append(
+            PluginManifest(superclass,
+                           description["name"],
+                           abspath,
+                           description["attributes"],
+                           description["doc"])
+        )
+
+    return plugins
+
+
 def plugin_from_module(superclass, module):
     """Return plug-ins from module
 
@@ -403,11 +1695,11 @@ def register_plugin(superclass, obj):
 
     """
 
-    if superclass not in _registered_plugins:
-        _registered_plugins[superclass] = list()
-
-    if obj not in _registered_plugins[superclass]:
-        _registered_plugins[superclass].append(obj)
+    _registered_plugins.update(
+        superclass,
+        lambda plugins: plugins if obj in plugins else plugins + (obj,),
+        default=()
+    )
 
 
 def register_plugin_path(superclass, path):
@@ -419,40 +1711,48 @@ def register_plugin_path(superclass, path):
 
     """
 
-    if superclass not in _registered_plugin_paths:
-        _registered_plugin_paths[superclass] = list()
-
     path = os.path.normpath(path)
-    if path not in _registered_plugin_paths[superclass]:
-        _registered_plugin_paths[superclass].append(path)
+    _registered_plugin_paths.update(
+        superclass,
+        lambda paths: paths if path in paths else paths + (path,),
+        default=()
+    )
 
 
 def registered_plugin_paths():
-    """Return all currently registered plug-in paths"""
+    """Return all currently registered plug-in paths
 
-    # Prohibit editing in-place
-    duplicate = {
-        superclass: paths[:]
-        for superclass, paths in _registered_plugin_paths.items()
-    }
+    Returns:
+        Immutable snapshot of tuples of paths, per superclass
+
+    """
+
+    return _registered_plugin_paths.snapshot()
 
-    return duplicate
+
+def _without(item):
+    """Return function removing `item` from a tuple, like `list.remove()`"""
+    def remove(items):
+        items = list(items)
+        items.remove(item)
+        return tuple(items)
+    return remove
 
 
 def deregister_plugin(superclass, plugin):
     """Oppsite of `register_plugin()`"""
-    _registered_plugins[superclass].remove(plugin)
+    _registered_plugins.update(superclass, _without(plugin), default=())
 
 
 def deregister_plugin_path(superclass, path):
     """Oppsite of `register_plugin_path()`"""
-    _registered_plugin_paths[superclass].remove(path)
+    _registered_plugin_paths.update(superclass, _without(path), default=())
 
 
 def register_root(path):
     """Register currently active root"""
     log.info("Registering root: %s" % path)
-    _registered_root["_"] = path
+    _registered_root.set("_", path)
 
 
 def registered_root():
@@ -481,11 +1781,35 @@ def on(event, callback):
 
     """
 
-    if event not in _registered_event_handlers:
-        _registered_event_handlers[event] = weakref.WeakSet()
+    def add(handlers):
+        # Drop handlers which have since been garbage collected
+        handlers = tuple(ref for ref in handlers if ref() is not None)
+
+        if any(ref() is callback for ref in handlers):
+            return handlers
+
+        # Handlers are only weakly referenced
+        return handlers + (weakref.ref(callback),)
+
+    _registered_event_handlers.update(event, add, default=())
+
+
+def off(event, callback):
+    """Stop calling `callback` on `event`
+
+    Arguments:
+        event (str): Name of event
+        callback (callable): As passed to `on()`
+
+    """
+
+    def remove(handlers):
+        return tuple(
+            ref for ref in handlers
+            if ref() is not None and ref() is not callback
+        )
 
-    events = _registered_event_handlers[event]
-    events.add(callback)
+    _registered_event_handlers.update(event, remove, default=())
 
 
 def before(event, callback):
@@ -510,20 +1834,53 @@ def emit(event, args=None):
         Init happened
         >>> del on_init
 
+    Within `lib.bulk_operation()` events are emitted on its exit, in
+    order, except before-events whose handlers may yet cancel what is
+    about to happen.
+
     Arguments:
         event (str): Name of event
         args (list, optional): List of arguments passed to callback
 
     """
 
-    callbacks = _registered_event_handlers.get(event, set())
     args = args or list()
 
-    for callback in callbacks:
+    if not event.startswith("before_") and lib.defer(emit, event, args):
+        return
+
+    if not recording.is_recording():
+        _emit(event, args)
+        return
+
+    started = time.time()
+    timings = _emit(event, args, timed=True)
+    recording.record(event, args, started, timings)
+
+
+def _emit(event, args, timed=False):
+    """Call handlers of `event`, returning how long each took if `timed`"""
+    handlers = _registered_event_handlers.get(event, ())
+    timings = list() if timed else None
+
+    for ref in handlers:
+        callback = ref()
+        if callback is None:
+            continue
+
+        started = time.time() if timed else None
+
         try:
             callback(*args)
         except Exception:
-            log.warning(traceback.format_exc())
+            # Traceback formatted by the handler, off the main thread
+            log.warning("Callback %s of '%s' failed", callback, event,
+                        exc_info=True)
+
+        if timed:
+            timings.append((callback, time.time() - started))
+
+    return timings
 
 
 def _register_callbacks():
@@ -557,11 +1914,17 @@ def _register_callbacks():
         OpenMaya.MSceneMessage.kAfterOpen, _on_scene_open
     )
 
+    self._events[_before_scene_open] = \
+        OpenMaya.MSceneMessage.addCheckFileCallback(
+            OpenMaya.MSceneMessage.kBeforeOpenCheck, _before_scene_open
+        )
+
     log.info("Installed event handler _on_scene_save..")
     log.info("Installed event handler _before_scene_save..")
     log.info("Installed event handler _on_scene_new..")
     log.info("Installed event handler _on_maya_initialized..")
     log.info("Installed event handler _on_scene_open..")
+    log.info("Installed event handler _before_scene_open..")
 
 
 def _on_maya_initialized(*args):
@@ -572,10 +1935,13 @@ def _on_maya_initialized(*args):
         return
 
     # Keep reference to the main Window, once a main window exists.
-    self._parent = {
-        widget.objectName(): widget
-        for widget in QtWidgets.QApplication.topLevelWidgets()
-    }["MayaWindow"]
+    self._parent = widgets.main_window()
+
+    if os.environ.get("JIMINY_QML_PREWARM"):
+        from .tools import publish
+
+        # Spawn the publish GUI's server once Maya is idle
+        cmds.evalDeferred(publish.prewarm, lowestPriority=True)
 
 
 def _on_scene_new(*args):
@@ -590,6 +1956,10 @@ def _on_scene_open(*args):
     emit("open", args)
 
 
+def _on_published(context):
+    emit("published", [context])
+
+
 def _before_scene_save(return_code, client_data):
 
     # Default to allowing the action. Registered
@@ -598,3 +1968,13 @@ def _before_scene_save(return_code, client_data):
     OpenMaya.MScriptUtil.setBool(return_code, True)
 
     emit("before_save", [return_code, client_data])
+
+
+def _before_scene_open(return_code, file_object, client_data):
+
+    # Default to allowing the action. Registered
+    # callbacks can optionally set this to False
+    # in order to block the operation.
+    OpenMaya.MScriptUtil.setBool(return_code, True)
+
+    emit("before_open", [return_code, file_object.resolvedFullName()])
@@ -0,0 +1,287 @@
+"""Read published files ahead of loading them
+
+Files are read on background threads, such that by the time Maya or a
+loader gets to them they are in the operating system's page cache, or
+copied to the local cache if installed and used by the loader, see
+:mod:`cache`.
+
+Example:
+    >>> prefetch_scene("/projects/hero/shots/sh020/lighting.ma")
+    12
+    >>> wait()
+
+Prefetching on scene open is enabled with $JIMINY_PREFETCH, which
+reads the publishes referenced by a scene whilst Maya opens it.
+
+"""
+
+import os
+import re
+import sys
+import logging
+import threading
+
+from .vendor import six
+from . import io, cache, pipeline
+
+log = logging.getLogger(__name__)
+
+self = sys.modules[__name__]
+self._installed = False
+self._queue = six.moves.queue.Queue()
+self._threads = list()
+self._pending = set()  # Paths queued or being read
+self._lock = threading.Lock()
+self._stats = dict()
+
+CONCURRENCY = 4  # Maximum number of files read at once
+
+_CHUNK = 1024 * 1024
+
+# Values of imprinted attributes of containers in a Maya Ascii scene
+_re_representation = re.compile(
+    r'setAttr "\.representation" -type "string" "([^"]+)"')
+
+# File commands of a Maya Ascii scene, which may span multiple lines
+_re_file = re.compile(r'^file\b([^;]*);', re.MULTILINE)
+_re_referenced = re.compile(r'\s-r(di)?\s')
+_re_string = re.compile(r'"([^"]*)"')
+
+
+def install():
+    """Prefetch publishes referenced by scenes as they are opened"""
+    self._installed = True
+    pipeline.before("open", _on_before_open)
+
+
+def uninstall():
+    self._installed = False
+
+
+def prefetch(paths, localize=False):
+    """Read each of `paths` in the background
+
+    Arguments:
+        paths (list): Paths to files, or pairs of path and checksum
+            passed to `cache.localize()`
+        localize (bool, optional): Copy files to the local cache, if
+            installed, rather than only reading them. Only for files
+            read from the cache thereafter, see `Loader.cached`.
+
+    Returns:
+        int: Number of files queued, excluding those already queued
+
+    """
+
+    queued = 0
+
+    for path in paths:
+        path, checksum = path if isinstance(path, tuple) else (path, None)
+
+        with self._lock:
+            if path in self._pending:
+                continue
+            self._pending.add(path)
+
+        self._queue.put((_fetch, (path, checksum, localize)))
+        queued += 1
+
+    _start()
+    return queued
+
+
+def prefetch_contexts(contexts, localize=False):
+    """Read publishes of each of `contexts` in the background
+
+    Arguments:
+        contexts (list): avalon-core:context-1.0, as passed to a Loader
+        localize (bool, optional): Copy to the local cache, see `prefetch()`
+
+    """
+
+    paths = list()
+    for context in contexts:
+        representation = context.get("representation") or {}
+        checksum = representation.get("data", {}).get("checksum")
+        paths.append((pipeline.get_representation_path(context), checksum))
+
+    return prefetch(paths, localize)
+
+
+def prefetch_scene(fname):
+    """Read publishes loaded into scene `fname` in the background
+
+    The scene is parsed rather than opened. Only Maya Ascii scenes
+    are supported, other scenes are ignored.
+
+    """
+
+    if not fname.endswith(".ma"):
+        log.debug("Not prefetching non-ascii scene %s" % fname)
+        return 0
+
+    with open(fname) as f:
+        text = f.read()
+
+    paths = list()
+
+    # Files referenced directly, whether or not they are containers
+    for command in _re_file.findall(text):
+        strings = _re_string.findall(command)
+        if strings and _re_referenced.search(command):
+            paths.append((os.path.expandvars(strings[-1]), None))
+
+    representations = set(_re_representation.findall(text))
+    if representations:
+        for context in _contexts(representations):
+            representation = context["representation"]
+            checksum = representation.get("data", {}).get("checksum")
+            paths.append((pipeline.get_representation_path(context),
+                          checksum))
+
+    return prefetch(paths)
+
+
+def _contexts(representation_ids):
+    """Return contexts of `representation_ids`, querying one level at a time
+
+    Representations not found in the database are skipped.
+
+    """
+
+    levels = ("representation", "version", "subset", "asset", "project")
+    documents = dict()
+    ids = list(representation_ids)
+
+    for level in levels:
+        if not ids:
+            break
+
+        found = io.find({"type": level, "_id": {"$in": ids}})
+        documents.update((document["_id"], document) for document in found)
+        ids = list(set(
+            document["parent"] for document in found
+            if document.get("parent") is not None
+        ))
+
+    contexts = list()
+    for representation_id in representation_ids:
+        document = documents.get(representation_id)
+        context = dict()
+
+        for level in levels:
+            if document is None:
+                break
+            context[level] = document
+            document = documents.get(document.get("parent"))
+
+        if len(context) == len(levels):
+            contexts.append(context)
+
+    return contexts
+
+
+def _submit(function, *args):
+    """Call `function` with `args` on a reading thread"""
+    self._queue.put((function, args))
+    _start()
+
+
+def _start():
+    """Start reading threads, up to `CONCURRENCY`
+
+    Threads then wait for more to read for the remainder of the session.
+
+    """
+
+    with self._lock:
+        # Replace any thread which has died
+        self._threads[:] = [
+            thread for thread in self._threads if thread.is_alive()
+        ]
+
+        while len(self._threads) < min(CONCURRENCY, self._queue.qsize()):
+            thread = threading.Thread(target=_work, name="jiminy-prefetch")
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+
+def _work():
+    while True:
+        function, args = self._queue.get()
+
+        try:
+            function(*args)
+        except Exception:
+            # Keep the thread, it's counted on to read what's queued
+            log.warning("Could not prefetch: %s%r" % (function.__name__, args),
+                        exc_info=True)
+            _count("errors")
+        finally:
+            self._queue.task_done()
+
+
+def _fetch(path, checksum, localize):
+    try:
+        _read(path, checksum, localize)
+    except (IOError, OSError) as e:
+        log.debug("Could not prefetch %s: %s" % (path, e))
+        _count("errors")
+    finally:
+        with self._lock:
+            self._pending.discard(path)
+
+
+def _read(path, checksum=None, localize=False):
+    if localize and cache.is_installed():
+        cache.localize(path, checksum)
+        _count("files")
+        return
+
+    # Read and discard, leaving the file in the page cache
+    size = 0
+    buffer = bytearray(_CHUNK)
+    with open(path, "rb") as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            size += read
+
+    _count("files")
+    _count("bytes", size)
+
+
+def wait():
+    """Block until all queued files have been read"""
+    self._queue.join()
+
+
+def _count(key, amount=1):
+    with self._lock:
+        self._stats[key] = self._stats.get(key, 0) + amount
+
+
+def stats():
+    """Return number of files and bytes read, and errors"""
+    result = {"files": 0, "bytes": 0, "errors": 0}
+    result.update(self._stats)
+    return result
+
+
+def _on_before_open(return_code, fname):
+    if not self._installed or not fname:
+        return
+
+    # Parsed on a reading thread, rather than delaying the open
+    _submit(_prefetch_opened, fname)
+
+
+def _prefetch_opened(fname):
+    try:
+        queued = prefetch_scene(fname)
+    except (IOError, OSError) as e:
+        log.warning("Could not prefetch %s: %s" % (fname, e))
+    else:
+        log.info("Prefetching %d publishes of %s" % (queued, fname))
@@ -0,0 +1,237 @@
+"""Timing of plug-ins, to find those slowing down the pipeline
+
+When enabled, execution of each plug-in file during discovery and each
+call to a Creator or Loader is timed. Timing costs a few microseconds
+per call, cheap enough to leave on in production.
+
+A fraction of calls may additionally be run under cProfile, for a
+detailed look at where time goes within the slowest plug-ins.
+
+Example:
+    >>> enable(sample=0.1)
+    >>> pipeline.discover(pipeline.Creator)
+    >>> print(report(limit=5))
+    kind            name                calls    total     mean      max
+    module          modelCreator.py         1   1.204s   1.204s   1.204s
+    ...
+    >>> stats("Creator.process", "ModelCreator").sort_stats("cumtime")
+
+Enable from the environment with $JIMINY_PROFILE=1, and optionally
+$JIMINY_PROFILE_SAMPLE=0.01 and $JIMINY_PROFILE_DIR=/path/to/dumps to
+write each sampled profile to disk.
+
+"""
+
+import os
+import sys
+import time
+import random
+import pstats
+import cProfile
+import threading
+import contextlib
+import functools
+
+self = sys.modules[__name__]
+self._enabled = bool(os.getenv("JIMINY_PROFILE"))
+self._sample = float(os.getenv("JIMINY_PROFILE_SAMPLE") or 0)
+self._directory = os.getenv("JIMINY_PROFILE_DIR") or None
+self._records = dict()  # Calls, total and longest duration, by kind and name
+self._stats = dict()  # Aggregated pstats.Stats, by kind and name
+self._lock = threading.Lock()
+self._local = threading.local()
+
+
+def enable(sample=0.0, directory=None):
+    """Time plug-ins from now on
+
+    Arguments:
+        sample (float, optional): Fraction of calls to run under cProfile,
+            from 0 to 1
+        directory (str, optional): Write each sampled profile here
+
+    """
+
+    self._enabled = True
+    self._sample = sample
+    self._directory = directory
+
+
+def disable():
+    self._enabled = False
+
+
+def is_enabled():
+    return self._enabled
+
+
+def reset():
+    """Forget everything measured so far"""
+    with self._lock:
+        self._records.clear()
+        self._stats.clear()
+
+
+@contextlib.contextmanager
+def measure(kind, name):
+    """Time the enclosed block, as `name` of `kind`
+
+    Arguments:
+        kind (str): Category, e.g. "module" or "Creator.process"
+        name (str): Plug-in measured, e.g. its class or file name
+
+    """
+
+    if not self._enabled:
+        yield
+        return
+
+    profile = None
+    if self._sample and not getattr(self._local, "profiling", False) and \
+            random.random() < self._sample:
+        profile = cProfile.Profile()
+
+    started = time.time()
+
+    try:
+        if profile is not None:
+            profile.enable()
+    except ValueError:
+        # Another profiler is active, such as one started by the user
+        profile = None
+
+    if profile is None:
+        try:
+            yield
+        finally:
+            _record(kind, name, time.time() - started)
+        return
+
+    # Only one profiler may be active at a time
+    self._local.profiling = True
+
+    try:
+        yield
+    finally:
+        profile.disable()
+        self._local.profiling = False
+        _record(kind, name, time.time() - started, profile)
+
+
+def wrap(function, kind, name):
+    """Return `function` timed as `name` of `kind` on every call"""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with measure(kind, name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def _record(kind, name, duration, profile=None):
+    key = (kind, name)
+
+    with self._lock:
+        calls, total, longest = self._records.get(key, (0, 0.0, 0.0))
+        self._records[key] = (calls + 1,
+                              total + duration,
+                              max(longest, duration))
+
+        if profile is None:
+            return
+
+        profile.create_stats()
+        if key in self._stats:
+            self._stats[key].add(profile)
+        else:
+            self._stats[key] = pstats.Stats(profile)
+
+    if self._directory:
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+
+        fname = "%s-%s-%d-%d.prof" % (kind,
+                                      os.path.basename(name),
+                                      os.getpid(),
+                                      int(time.time() * 1000))
+        profile.dump_stats(os.path.join(self._directory, fname))
+
+
+def records(sort="total"):
+    """Return measurements, slowest first
+
+    Arguments:
+        sort (str, optional): Key to sort by, one of "total",
+            "mean", "max" or "calls"
+
+    Returns:
+        list: Dictionaries with "kind", "name", "calls", "total",
+            "mean", "max" and whether cProfile "stats" are available
+
+    """
+
+    with self._lock:
+        items = list(self._records.items())
+        profiled = set(self._stats)
+
+    result = list()
+    for (kind, name), (calls, total, longest) in items:
+        result.append({
+            "kind": kind,
+            "name": name,
+            "calls": calls,
+            "total": total,
+            "mean": total / calls,
+            "max": longest,
+            "stats": (kind, name) in profiled,
+        })
+
+    return sorted(result, key=lambda record: record[sort], reverse=True)
+
+
+def report(sort="total", limit=20):
+    """Return human readable table of the slowest plug-ins"""
+    lines = ["%-16s %-30s %6s %9s %9s %9s" % (
+        "kind", "name", "calls", "total", "mean", "max")]
+
+    for record in records(sort)[:limit]:
+        lines.append("%-16s %-30s %6d %8.3fs %8.3fs %8.3fs" % (
+            record["kind"],
+            os.path.basename(record["name"])[:30],
+            record["calls"],
+            record["total"],
+            record["mean"],
+            record["max"]))
+
+    return "\n".join(lines)
+
+
+def stats(kind, name):
+    """Return pstats.Stats of sampled calls of `name`, or None"""
+    with self._lock:
+        return self._stats.get((kind, name))
+
+
+def dump_stats(directory):
+    """Write aggregated cProfile statistics of each plug-in to `directory`
+
+    Returns:
+        list: Paths written
+
+    """
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with self._lock:
+        items = list(self._stats.items())
+
+    written = list()
+    for (kind, name), data in items:
+        fname = os.path.join(directory, "%s-%s.prof" % (
+            kind, os.path.basename(name)))
+        data.dump_stats(fname)
+        written.append(fname)
+
+    return written
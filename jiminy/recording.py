@@ -0,0 +1,343 @@
+"""Recording of emitted events, and their replay against current handlers
+
+A recording holds, for each call to `emit()`, the event, when it
+happened, the shape of its arguments and how long each handler took,
+along with the handlers registered when recording started. Arguments
+are recorded by type only, except for short strings and numbers, such
+that recordings are compact and free of scene data.
+
+Example:
+    >>> start("/tmp/session.jsonl.gz")
+    >>> # ... work, save, open ...
+    >>> stop()
+
+Recordings are replayed with the handlers currently registered, calling
+them with stand-ins for the original arguments, and timing each.
+
+    $ python -m jiminy.recording /tmp/session.jsonl.gz
+
+Record a whole session by setting $JIMINY_RECORD to a file name.
+
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import logging
+import argparse
+import threading
+
+from .vendor import six
+from . import _registered_event_handlers
+
+log = logging.getLogger(__name__)
+
+self = sys.modules[__name__]
+self._file = None  # Open recording, if recording
+self._started = None
+self._lock = threading.Lock()
+
+VERSION = 1
+
+MAX_STRING = 256  # Longer strings are recorded by length only
+
+
+def start(fname):
+    """Record emitted events to `fname`, compressed if it ends with .gz"""
+    stop()
+
+    opener = gzip.open if fname.endswith(".gz") else open
+    f = opener(fname, "wt") if six.PY3 else opener(fname, "w")
+
+    self._started = time.time()
+    _write(f, {
+        "version": VERSION,
+        "started": self._started,
+        "handlers": dict(
+            (event, [_name(ref()) for ref in refs if ref() is not None])
+            for event, refs in _registered_event_handlers.items()
+        ),
+    })
+
+    self._file = f
+    log.info("Recording events to %s", fname)
+
+
+def stop():
+    """Stop recording, if recording"""
+    with self._lock:
+        f, self._file = self._file, None
+
+    if f is not None:
+        f.close()
+
+
+def is_recording():
+    return self._file is not None
+
+
+def record(event, args, started, timings):
+    """Record `event` emitted with `args` at `started`
+
+    Arguments:
+        event (str): Name of event
+        args (list): Arguments passed to handlers
+        started (float): Time of emit
+        timings (list): Pairs of handler and seconds taken
+
+    """
+
+    data = {
+        "time": round(started - self._started, 6),
+        "event": event,
+        "args": [shape(arg) for arg in args],
+        "handlers": [[_name(callback), round(duration, 6)]
+                     for callback, duration in timings],
+    }
+
+    with self._lock:
+        if self._file is not None:
+            _write(self._file, data)
+
+
+def _write(f, data):
+    f.write(json.dumps(data, separators=(",", ":")) + "\n")
+    f.flush()
+
+
+def _name(callback):
+    if callback is None:
+        return None
+
+    name = getattr(callback, "__qualname__", None) or \
+        getattr(callback, "__name__", None) or type(callback).__name__
+
+    return "%s.%s" % (getattr(callback, "__module__", None), name)
+
+
+def shape(value):
+    """Return description of `value`, without its contents
+
+    Short strings, numbers, booleans and None are kept as-is.
+
+    """
+
+    if value is None or isinstance(value, (bool, float) +
+                                   six.integer_types):
+        return {"value": value}
+
+    if isinstance(value, six.string_types) and len(value) <= MAX_STRING:
+        return {"value": value}
+
+    data = {"type": "%s.%s" % (type(value).__module__,
+                               type(value).__name__)}
+
+    try:
+        data["length"] = len(value)
+    except TypeError:
+        pass
+
+    return data
+
+
+class StandIn(object):
+    """Replaces a recorded argument of which only its type is known
+
+    Any attribute or call returns another stand-in, such that handlers
+    using the argument in passing run as they would.
+
+    """
+
+    def __init__(self, shape):
+        self.shape = shape
+
+    def __repr__(self):
+        return "<StandIn %s>" % self.shape.get("type")
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return StandIn({"type": "%s.%s" % (self.shape.get("type"), attr)})
+
+    def __call__(self, *args, **kwargs):
+        return StandIn({"type": "%s()" % self.shape.get("type")})
+
+    def __len__(self):
+        return self.shape.get("length", 0)
+
+    def __iter__(self):
+        return iter(())
+
+
+def read(fname):
+    """Return header and events of recording `fname`"""
+    opener = gzip.open if fname.endswith(".gz") else open
+    with opener(fname, "rt") if six.PY3 else opener(fname) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+
+    if not lines or lines[0].get("version") != VERSION:
+        raise ValueError("%s is not a recording of version %s"
+                         % (fname, VERSION))
+
+    return lines[0], lines[1:]
+
+
+def replay(fname, realtime=False):
+    """Emit events of recording `fname` to the handlers registered now
+
+    Arguments:
+        fname (str): Path to recording
+        realtime (bool, optional): Wait between events as recorded,
+            rather than emitting them back to back
+
+    Returns:
+        dict: Report, see `format_report()`
+
+    """
+
+    from . import pipeline
+
+    header, events = read(fname)
+    started = time.time()
+    results = list()
+
+    for event in events:
+        if realtime:
+            delay = event["time"] - (time.time() - started)
+            if delay > 0:
+                time.sleep(delay)
+
+        args = [
+            arg["value"] if "value" in arg else StandIn(arg)
+            for arg in event["args"]
+        ]
+
+        timings = pipeline._emit(event["event"], args, timed=True)
+        results.append({
+            "event": event["event"],
+            "recorded": sum(duration for _, duration in event["handlers"]),
+            "replayed": sum(duration for _, duration in timings),
+            "handlers": [[_name(callback), duration]
+                         for callback, duration in timings],
+        })
+
+    current = dict(
+        (event, [_name(ref()) for ref in refs if ref() is not None])
+        for event, refs in _registered_event_handlers.items()
+    )
+
+    return {
+        "events": results,
+        "added": _difference(current, header["handlers"]),
+        "removed": _difference(header["handlers"], current),
+    }
+
+
+def _difference(a, b):
+    """Return handlers of `a` not in `b`, by event"""
+    result = dict()
+    for event, handlers in a.items():
+        missing = [h for h in handlers if h not in b.get(event, [])]
+        if missing:
+            result[event] = missing
+    return result
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def format_report(report):
+    """Return human readable summary of `replay()`, slowest first"""
+    by_event = dict()
+    for result in report["events"]:
+        by_event.setdefault(result["event"], list()).append(result)
+
+    lines = ["%-16s %6s %12s %12s %12s %12s" % (
+        "event", "count", "recorded", "replayed", "p95", "max")]
+
+    rows = sorted(
+        by_event.items(),
+        key=lambda item: sum(r["replayed"] for r in item[1]),
+        reverse=True,
+    )
+
+    for event, results in rows:
+        replayed = [r["replayed"] for r in results]
+        lines.append("%-16s %6d %11.1fms %11.1fms %11.1fms %11.1fms" % (
+            event,
+            len(results),
+            sum(r["recorded"] for r in results) / len(results) * 1000,
+            sum(replayed) / len(replayed) * 1000,
+            _percentile(replayed, 0.95) * 1000,
+            max(replayed) * 1000))
+
+    handlers = dict()
+    for result in report["events"]:
+        for name, duration in result["handlers"]:
+            handlers[name] = handlers.get(name, 0.0) + duration
+
+    if handlers:
+        lines.append("")
+        lines.append("Slowest handlers, in total:")
+        for name, total in sorted(handlers.items(),
+                                  key=lambda item: item[1],
+                                  reverse=True)[:10]:
+            lines.append("  %8.1fms %s" % (total * 1000, name))
+
+    for title, key in (("Added since recording", "added"),
+                       ("Removed since recording", "removed")):
+        for event, names in sorted(report[key].items()):
+            lines.append("%s, %s: %s" % (title, event, ", ".join(names)))
+
+    return "\n".join(lines)
+
+
+def _cli(args):
+    """jiminy.recording command-line interface"""
+    parser = argparse.ArgumentParser(prog="python -m jiminy.recording")
+    parser.add_argument("recording", help="Path to recording")
+    parser.add_argument("--snapshot",
+                        help="Restore pipeline from snapshot, "
+                             "rather than installing it")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Wait between events as recorded")
+    parser.add_argument("--report",
+                        help="Write report as JSON to this path")
+
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        import maya.standalone
+    except ImportError:
+        pass  # Not in mayapy, handlers requiring Maya will fail
+    else:
+        maya.standalone.initialize(name="python")
+
+    from . import pipeline
+
+    # Recording whilst replaying could overwrite the very recording
+    os.environ.pop("JIMINY_RECORD", None)
+
+    if args.snapshot:
+        pipeline.restore_state(args.snapshot)
+    else:
+        pipeline.install()
+
+    report = replay(args.recording, realtime=args.realtime)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=4)
+
+    sys.stdout.write(format_report(report) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_cli(sys.argv[1:]))
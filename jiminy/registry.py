@@ -0,0 +1,129 @@
+"""Copy-on-write registries holding the state of jiminy
+
+Registries are never modified in place. Each write builds a new frozen
+snapshot and swaps it in, such that readers on any thread get a
+consistent snapshot without locking or copying.
+
+"""
+
+import threading
+
+
+class FrozenDict(dict):
+    """Dictionary which may not be modified"""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("%s is immutable" % type(self).__name__)
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class Registry(object):
+    """Mapping replaced as a whole on every write
+
+    Values are stored as given, so should be immutable themselves,
+    e.g. tuples rather than lists.
+
+    Example:
+        >>> plugins = Registry()
+        >>> plugins.update("Creator", lambda value: value + ("A",), ())
+        >>> snapshot = plugins.snapshot()
+        >>> plugins.set("Creator", ("B",))
+        >>> snapshot["Creator"], plugins["Creator"]
+        (('A',), ('B',))
+        >>> plugins.version
+        2
+
+    """
+
+    def __init__(self, initial=None):
+        # Re-entrant, as writes may trigger garbage collection
+        # which in turn may write, e.g. from a weakref callback.
+        self._lock = threading.RLock()
+        self._snapshot = FrozenDict(initial or {})
+
+        # Incremented on every write, for caches to key on
+        self.version = 0
+
+    def __repr__(self):
+        return "Registry(%r)" % dict(self._snapshot)
+
+    def __getitem__(self, key):
+        return self._snapshot[key]
+
+    def __contains__(self, key):
+        return key in self._snapshot
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def snapshot(self):
+        """Return current contents, as an immutable dictionary"""
+        return self._snapshot
+
+    def get(self, key, default=None):
+        return self._snapshot.get(key, default)
+
+    def keys(self):
+        return self._snapshot.keys()
+
+    def values(self):
+        return self._snapshot.values()
+
+    def items(self):
+        return self._snapshot.items()
+
+    def update(self, key, function, default=None):
+        """Replace value of `key` with `function(value)`
+
+        Any exception raised by `function` leaves the registry untouched.
+
+        Arguments:
+            key (object): Key to update
+            function (callable): Passed current value, returns new value
+            default (object, optional): Current value if `key` is missing
+
+        """
+
+        with self._lock:
+            contents = dict(self._snapshot)
+            contents[key] = function(contents.get(key, default))
+            self._swap(contents)
+
+    def set(self, key, value):
+        with self._lock:
+            contents = dict(self._snapshot)
+            contents[key] = value
+            self._swap(contents)
+
+    def pop(self, key, *default):
+        with self._lock:
+            contents = dict(self._snapshot)
+            value = contents.pop(key, *default)
+            self._swap(contents)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._swap({})
+
+    def replace(self, contents):
+        """Replace all contents at once, such as with an earlier snapshot"""
+        with self._lock:
+            self._swap(contents)
+
+    def _swap(self, contents):
+        self._snapshot = FrozenDict(contents)
+        self.version += 1
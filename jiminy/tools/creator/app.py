@@ -5,11 +5,10 @@ import inspect
 from ...vendor.Qt import QtWidgets, QtCore, QtGui
 from ...vendor import qtawesome
 from ...vendor import six
-from ... import api, io
+from ... import api, io, widgets
 from .. import lib
 
 module = sys.modules[__name__]
-module.window = None
 module.root = api.registered_root()
 
 HelpRole = QtCore.Qt.UserRole + 2
@@ -267,7 +266,8 @@ class Window(QtWidgets.QDialog):
 
         has_families = False
 
-        creators = api.discover(api.Creator)
+        # Listed without executing each plug-in's module
+        creators = api.discover_manifest(api.Creator)
 
         for creator in creators:
             label = creator.label or creator.family
@@ -434,9 +434,8 @@ def show(debug=False, parent=None):
 
     """
 
-    if module.window:
-        module.window.close()
-        del(module.window)
+    # Replace the window of a previous show, unless already deleted
+    widgets.delete("creator")
 
     if debug:
         from avalon import mock
@@ -461,4 +460,4 @@ def show(debug=False, parent=None):
         window.refresh()
         window.show()
 
-        module.window = window
+        widgets.register("creator", window)
@@ -1,8 +1,23 @@
 import os
+import sys
+import logging
+
 from pyblish import api
 
+from ... import widgets
+from ...vendor.Qt import QtWidgets
+
 ICON = os.path.join(os.path.dirname(api.__file__), "icons", "logo-32x32.svg")
 
+log = logging.getLogger(__name__)
+
+self = sys.modules[__name__]
+self._gui = None  # Resolved GUI, see `_discover_gui()`
+
+# Versions of pyblish-qml, from and up to, of which the private state of
+# its host is managed here. Others are left to `pyblish_qml.show()`.
+QML_VERSIONS = ((1, 11), (2, 0))
+
 
 def show(parent=None):
     """Try showing the most desirable GUI
@@ -13,16 +28,144 @@ def show(parent=None):
 
     """
 
-    return _discover_gui()(parent)
+    gui = _discover_gui()
+
+    if _is_qml(gui) and _current_server() is not None and not healthy():
+        # Don't hand pyblish-qml a server that has gone away
+        reconnect()
+
+    # Replace the window of a previous show, unless already deleted
+    widgets.delete("publish")
+
+    window = gui(parent)
+
+    # pyblish-qml runs in a process of its own, leaving no window here
+    if isinstance(window, QtWidgets.QWidget):
+        widgets.register("publish", window)
+
+    return window
 
 
 def _discover_gui():
-    """Return the default GUI"""
+    """Return the default GUI, resolved once
+
+    pyblish-qml is preferred over pyblish-lite. The first found is kept
+    for the session, such that neither is imported again on show. With
+    neither available, ImportError is raised, and resolved anew on the
+    next call.
+
+    """
+    if self._gui is not None:
+        return self._gui
+
     try:
         gui = __import__("pyblish_qml").show
     except (ImportError, AttributeError):
-        gui = __import__("pyblish_lite").show
-    else:
-        return gui
+        try:
+            gui = __import__("pyblish_lite").show
+        except (ImportError, AttributeError):
+            raise ImportError("No Pyblish GUI found")
+
+    self._gui = gui
+    return gui
+
+
+def _is_qml(gui):
+    return gui.__module__.startswith("pyblish_qml")
+
+
+def _qml_host():
+    """Return host of pyblish-qml, if its private state is as expected"""
+    try:
+        import pyblish_qml
+        from pyblish_qml import host
+    except ImportError:
+        return None
+
+    version = tuple(getattr(pyblish_qml, "version_info", ()))
+    if not QML_VERSIONS[0] <= version < QML_VERSIONS[1] or \
+            not isinstance(getattr(host, "_state", None), dict):
+        log.debug("Leaving the server of pyblish-qml %s to pyblish-qml"
+                  % getattr(pyblish_qml, "version", "unknown"))
+        return None
+
+    return host
+
+
+def _current_server():
+    host = _qml_host()
+    if host is None:
+        return None
+
+    return host._state.get("currentServer")
+
+
+def healthy():
+    """Return whether the pyblish-qml server process is running"""
+    server = _current_server()
+    popen = getattr(server, "popen", None)
+    if popen is None:
+        return False
+
+    return popen.poll() is None
+
+
+def prewarm():
+    """Spawn the pyblish-qml server ahead of its first use
+
+    The external Python process hosting pyblish-qml is started in
+    the background, such that "Publish..." needn't wait for it.
+    Does nothing if pyblish-qml isn't the resolved GUI, is of a
+    version other than `QML_VERSIONS`, or the server is already
+    running.
+
+    Returns:
+        bool: Whether a server is running
+
+    """
+
+    if not _is_qml(_discover_gui()):
+        return False
+
+    host = _qml_host()
+    if host is None:
+        # Spawned by pyblish_qml.show() instead
+        return False
+
+    if healthy():
+        return True
+
+    from pyblish_qml import ipc
+
+    try:
+        service = ipc.service.Service()
+        server = ipc.server.Server(service)
+    except Exception as e:
+        # Not fatal, the server is spawned on show instead
+        log.warning("Could not pre-spawn pyblish-qml: %s" % e)
+        return False
+
+    host._state["currentServer"] = server
+    log.info("pyblish-qml server running (pid %s)" % server.popen.pid)
+
+    return True
+
+
+def reconnect():
+    """Replace a server which has died with a new one
+
+    Without a supported version of pyblish-qml, see `QML_VERSIONS`,
+    a server which has died is replaced by `pyblish_qml.show()`.
+
+    """
+
+    host = _qml_host()
+    if host is None:
+        return False
+
+    server = host._state.pop("currentServer", None)
+    if server is not None and server.popen.poll() is not None:
+        log.info("pyblish-qml server exited with %s, "
+                 "respawning.." % server.popen.returncode)
 
-    raise ImportError("No Pyblish GUI found")
+    return prewarm()
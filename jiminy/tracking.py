@@ -0,0 +1,376 @@
+"""Tracking of instances changed since they were last published
+
+Instances, and each of their members along with its descendants, are
+watched with Maya callbacks. An instance is dirty once any of these
+have an attribute set, are connected, disconnected or renamed, or the
+instance gains or loses members.
+
+Example:
+    >>> install()
+    >>> cmds.setAttr("pCube1.translateX", 1)
+    >>> dirty_instances()
+    ['modelDefault']
+
+Callbacks merely take note of the node changed, which is resolved to
+its instances once Maya is idle, such that interactive editing isn't
+slowed down by tracking, however many changes are made at once.
+
+Instances are dirty until published in this session, as whether they
+changed before the scene was opened is unknown. Changes upstream of
+members, such as deformers, aren't seen; see :mod:`incremental` for
+fingerprints covering those.
+
+"""
+
+import sys
+import logging
+
+from maya import cmds, OpenMaya
+
+from . import lib, pipeline
+
+log = logging.getLogger(__name__)
+
+self = sys.modules[__name__]
+self._installed = False
+self._events = dict()  # Registered Maya callbacks, by handler
+self._nodes = dict()  # Handle and callbacks of tracked nodes, by hash
+self._instances = dict()  # Hashes of members, by hash of instance
+self._members = dict()  # Hashes of instances, by hash of member
+self._dirty = set()  # Hashes of dirty instances
+self._changed = set()  # Hashes of nodes changed since last resolved
+self._added = list()  # Handles of objectSets created since last resolved
+self._scheduled = False
+
+# Changes of attributes making an instance dirty
+_CHANGES = (
+    OpenMaya.MNodeMessage.kAttributeSet |
+    OpenMaya.MNodeMessage.kConnectionMade |
+    OpenMaya.MNodeMessage.kConnectionBroken |
+    OpenMaya.MNodeMessage.kAttributeAdded |
+    OpenMaya.MNodeMessage.kAttributeRemoved |
+    OpenMaya.MNodeMessage.kAttributeRenamed
+)
+
+
+def install():
+    """Track instances of the current scene, and scenes opened hereafter"""
+    uninstall()
+
+    self._events[_on_node_added] = \
+        OpenMaya.MDGMessage.addNodeAddedCallback(_on_node_added,
+                                                 "objectSet")
+
+    self._events[_on_dag_changed] = \
+        OpenMaya.MDagMessage.addAllDagChangesCallback(_on_dag_changed)
+
+    pipeline.on("open", _on_scene_changed)
+    pipeline.on("new", _on_scene_changed)
+    pipeline.on("published", _on_published)
+
+    self._installed = True
+    _scan()
+
+
+def uninstall():
+    for handler, event in self._events.copy().items():
+        try:
+            OpenMaya.MMessage.removeCallback(event)
+        except RuntimeError as e:
+            log.info(e)
+
+    self._events.clear()
+    self._installed = False
+    _reset()
+
+
+def is_installed():
+    return self._installed
+
+
+def dirty_instances():
+    """Return names of instances changed since they were last published
+
+    Without tracking installed, every instance is considered dirty.
+
+    """
+
+    if not self._installed:
+        return sorted(lib.lsattr("id", pipeline.INSTANCE_ID))
+
+    _resolve()
+
+    return sorted(
+        _name(self._nodes[key][0]) for key in self._dirty
+        if key in self._nodes and self._nodes[key][0].isValid()
+    )
+
+
+def is_dirty(instance):
+    """Return whether `instance`, by name, is dirty"""
+    return instance in dirty_instances()
+
+
+def clean(instances=None):
+    """Consider `instances` unchanged, defaults to every instance
+
+    Arguments:
+        instances (list, optional): Names of instances
+
+    """
+
+    _resolve()
+
+    if instances is None:
+        self._dirty.clear()
+        return
+
+    for instance in instances:
+        key = _hash(instance)
+        if key is not None:
+            self._dirty.discard(key)
+
+
+def _reset():
+    for handle, callbacks in self._nodes.values():
+        for callback in callbacks:
+            try:
+                OpenMaya.MMessage.removeCallback(callback)
+            except RuntimeError:
+                pass  # Removed along with its node
+
+    self._nodes.clear()
+    self._instances.clear()
+    self._members.clear()
+    self._dirty.clear()
+    self._changed.clear()
+    self._added[:] = []
+
+
+def _scan():
+    """Track every instance of the current scene, as dirty"""
+    _reset()
+
+    for node in lib.lsattr("id", pipeline.INSTANCE_ID):
+        key = _track_instance(node)
+        self._dirty.add(key)
+
+    log.info("Tracking %d instances and %d nodes"
+             % (len(self._instances), len(self._nodes)))
+
+
+def _track(node):
+    """Register callbacks of `node`, returning its hash"""
+    obj = _mobject(node)
+    handle = OpenMaya.MObjectHandle(obj)
+    key = handle.hashCode()
+
+    if key in self._nodes:
+        return key
+
+    self._nodes[key] = (handle, [
+        OpenMaya.MNodeMessage.addAttributeChangedCallback(
+            obj, _on_attribute_changed, key),
+        OpenMaya.MNodeMessage.addNameChangedCallback(
+            obj, _on_name_changed, key),
+        OpenMaya.MNodeMessage.addNodePreRemovalCallback(
+            obj, _on_node_removed, key),
+    ])
+
+    return key
+
+
+def _untrack(key):
+    handle, callbacks = self._nodes.pop(key, (None, ()))
+    for callback in callbacks:
+        try:
+            OpenMaya.MMessage.removeCallback(callback)
+        except RuntimeError:
+            pass
+
+
+def _track_instance(node):
+    """Track instance `node` and its current members"""
+    key = _track(node)
+
+    # Both commands act on the selection, or everything, given no nodes
+    members = cmds.sets(node, query=True) or list()
+    nodes = set(cmds.ls(members, objectsOnly=True, long=True)
+                if members else ())
+    nodes.update(cmds.listRelatives(list(nodes),
+                                    allDescendents=True,
+                                    fullPath=True) or ()
+                 if nodes else ())
+
+    previous = self._instances.get(key, set())
+    current = set()
+
+    for member in nodes:
+        member_key = _track(member)
+        current.add(member_key)
+        self._members.setdefault(member_key, set()).add(key)
+
+    for member_key in previous - current:
+        instances = self._members.get(member_key, set())
+        instances.discard(key)
+
+        if not instances:
+            self._members.pop(member_key, None)
+            if member_key not in self._instances:
+                _untrack(member_key)
+
+    self._instances[key] = current
+    return key
+
+
+def _untrack_instance(key):
+    for member_key in self._instances.pop(key, set()):
+        instances = self._members.get(member_key, set())
+        instances.discard(key)
+
+        if not instances:
+            self._members.pop(member_key, None)
+            if member_key not in self._instances:
+                _untrack(member_key)
+
+    self._dirty.discard(key)
+
+    if key not in self._members:
+        _untrack(key)
+
+
+def _resolve():
+    """Mark instances of nodes changed since last resolved as dirty"""
+    self._scheduled = False
+
+    added, self._added[:] = self._added[:], []
+    changed, self._changed = self._changed, set()
+
+    for handle in added:
+        if not handle.isValid():
+            continue
+
+        node = _name(handle)
+        if cmds.attributeQuery("id", node=node, exists=True) and \
+                cmds.getAttr(node + ".id") == pipeline.INSTANCE_ID:
+            self._dirty.add(_track_instance(node))
+
+    rescan = set()
+    for key in changed:
+        if key in self._instances:
+            # Members of the instance itself may have changed
+            rescan.add(key)
+
+        for instance in self._members.get(key, ()):
+            self._dirty.add(instance)
+
+    for key in rescan:
+        handle = self._nodes[key][0]
+
+        if not handle.isValid():
+            _untrack_instance(key)
+            continue
+
+        self._dirty.add(key)
+        _track_instance(_name(handle))
+
+    # Members deleted along with their instance, or on their own
+    for key in list(self._nodes):
+        if not self._nodes[key][0].isValid() and key not in self._instances:
+            for instance in self._members.pop(key, ()):
+                self._instances.get(instance, set()).discard(key)
+            _untrack(key)
+
+
+def _note(key):
+    """Take note of node of `key` having changed, resolved when idle"""
+    self._changed.add(key)
+
+    if not self._scheduled:
+        self._scheduled = True
+        cmds.evalDeferred(_resolve_deferred, lowestPriority=True)
+
+
+def _resolve_deferred():
+    if self._installed and self._scheduled:
+        _resolve()
+
+
+def _on_attribute_changed(msg, plug, other_plug, key):
+    if msg & _CHANGES:
+        _note(key)
+
+
+def _on_name_changed(node, previous_name, key):
+    _note(key)
+
+
+def _on_node_removed(node, key):
+    _note(key)
+
+
+def _on_node_added(node, client_data):
+    # Not yet imprinted, checked once idle
+    self._added.append(OpenMaya.MObjectHandle(node))
+
+    if not self._scheduled:
+        self._scheduled = True
+        cmds.evalDeferred(_resolve_deferred, lowestPriority=True)
+
+
+def _on_dag_changed(msg, child, parent, client_data):
+    for path in (child, parent):
+        try:
+            key = OpenMaya.MObjectHandle(path.node()).hashCode()
+        except RuntimeError:
+            continue  # The world
+
+        if key in self._members:
+            # Descendants of a member, rescanned along with its instances
+            for instance in self._members[key]:
+                _note(instance)
+
+
+def _on_scene_changed(*args):
+    if self._installed:
+        _scan()
+
+
+def _on_published(context):
+    """Consider instances published without error as unchanged"""
+    if not self._installed:
+        return
+
+    failed = set(
+        id(result["instance"])
+        for result in context.data.get("results", [])
+        if result["error"] and result.get("instance") is not None
+    )
+
+    published = list()
+    for instance in context:
+        if not instance.data.get("publish", True) or id(instance) in failed:
+            continue
+
+        published.append(instance.data.get("objectName", instance.name))
+
+    clean(published)
+
+
+def _mobject(node):
+    selection = OpenMaya.MSelectionList()
+    selection.add(node)
+    obj = OpenMaya.MObject()
+    selection.getDependNode(0, obj)
+    return obj
+
+
+def _hash(node):
+    try:
+        return OpenMaya.MObjectHandle(_mobject(node)).hashCode()
+    except RuntimeError:
+        return None
+
+
+def _name(handle):
+    return OpenMaya.MFnDependencyNode(handle.object()).name()
@@ -0,0 +1,172 @@
+"""Resolution of latest versions for containers in the scene
+
+Finding what needs updating takes three queries at most, regardless of
+the number of containers. Two resolve the representations and versions
+loaded by all of them, and one finds the latest version of every subset
+involved.
+
+A representation's version never changes, so that resolution is kept
+for the session, once found. Latest versions are kept for `TTL` seconds, and are
+dropped when a publish completes in this session.
+
+"""
+
+import sys
+import time
+import threading
+
+from . import io, pipeline
+
+self = sys.modules[__name__]
+self._lock = threading.Lock()
+self._latest = dict()  # Latest version, and when it was queried, by subset
+self._versions = dict()  # Version of each representation
+
+TTL = 60.0  # Seconds until latest versions are queried again
+
+
+def latest_versions(subset_ids):
+    """Return latest version document of each subset
+
+    Arguments:
+        subset_ids (iterable): Ids of subsets
+
+    Returns:
+        dict: Version document, or None if there are no versions, by subset
+
+    """
+
+    now = time.time()
+    result = dict()
+    missing = list()
+
+    with self._lock:
+        for subset_id in set(subset_ids):
+            cached = self._latest.get(subset_id)
+            if cached is not None and now - cached[0] < TTL:
+                result[subset_id] = cached[1]
+            else:
+                missing.append(subset_id)
+
+    if not missing:
+        return result
+
+    latest = dict.fromkeys(missing)
+    for version in io.find({"type": "version", "parent": {"$in": missing}},
+                           projection={"name": 1, "parent": 1}):
+        current = latest[version["parent"]]
+        if current is None or version["name"] > current["name"]:
+            latest[version["parent"]] = version
+
+    with self._lock:
+        for subset_id, version in latest.items():
+            self._latest[subset_id] = (now, version)
+
+    result.update(latest)
+    return result
+
+
+def loaded_versions(representation_ids):
+    """Return version document of each representation
+
+    Returns:
+        dict: Version document, or None if not found, by representation
+
+    """
+
+    representation_ids = set(representation_ids)
+    result = dict()
+    missing = list()
+
+    with self._lock:
+        for representation_id in representation_ids:
+            if representation_id in self._versions:
+                result[representation_id] = \
+                    self._versions[representation_id]
+            else:
+                missing.append(representation_id)
+
+    if missing:
+        parents = dict(
+            (representation["_id"], representation["parent"])
+            for representation in io.find(
+                {"type": "representation", "_id": {"$in": missing}},
+                projection={"parent": 1}
+            )
+        )
+
+        version_ids = list(set(parents.values()))
+        versions = dict(
+            (version["_id"], version)
+            for version in io.find(
+                {"type": "version", "_id": {"$in": version_ids}},
+                projection={"name": 1, "parent": 1}
+            )
+        )
+
+        for representation_id in missing:
+            result[representation_id] = versions.get(
+                parents.get(representation_id))
+
+        # Representations not found may be published later, such as
+        # by another machine, so only those found are kept
+        with self._lock:
+            self._versions.update(
+                (representation_id, version)
+                for representation_id, version in result.items()
+                if version is not None
+            )
+
+    return result
+
+
+def outdated_containers(containers=None):
+    """Return containers of which a later version has been published
+
+    Arguments:
+        containers (list, optional): Containers to check, as from
+            `pipeline.ls()`, defaults to all in the scene
+
+    """
+
+    if containers is None:
+        containers = list(pipeline.ls())
+
+    loaded = loaded_versions(
+        container["representation"] for container in containers
+    )
+
+    latest = latest_versions(
+        version["parent"] for version in loaded.values() if version
+    )
+
+    outdated = list()
+    for container in containers:
+        version = loaded[container["representation"]]
+
+        # Not in the database, nothing to update to
+        if version is None:
+            continue
+
+        newest = latest[version["parent"]]
+        if newest is not None and newest["name"] > version["name"]:
+            outdated.append(container)
+
+    return outdated
+
+
+def invalidate(subset_ids=None):
+    """Query latest versions of `subset_ids` again, defaults to all"""
+    with self._lock:
+        if subset_ids is None:
+            self._latest.clear()
+        else:
+            for subset_id in subset_ids:
+                self._latest.pop(subset_id, None)
+
+
+def _on_published(*args):
+    invalidate()
+
+
+pipeline.on("published", _on_published)
@@ -0,0 +1,112 @@
+"""Handles to Maya's main window, and to menus and windows of the pipeline
+
+Widgets are resolved once and looked up by name thereafter, rather than
+searching every widget of the application, of which a Maya session has
+tens of thousands.
+
+Example:
+    >>> register("publish", window)
+    >>> get("publish") is window
+    True
+    >>> delete("publish")
+
+"""
+
+import sys
+import weakref
+
+from maya import cmds
+
+from .vendor.Qt import QtWidgets, QtCompat
+from .vendor import six
+
+self = sys.modules[__name__]
+self._main_window = None
+self._handles = dict()  # Weak reference to widget, or path to Maya UI
+
+
+def main_window():
+    """Return Maya's main window, resolved once per session"""
+    if self._main_window is None:
+        self._main_window = _resolve_main_window()
+    return self._main_window
+
+
+def _resolve_main_window():
+    try:
+        from maya import OpenMayaUI
+        pointer = OpenMayaUI.MQtUtil.mainWindow()
+    except (ImportError, AttributeError):
+        pointer = None
+
+    if pointer is not None and hasattr(QtCompat, "wrapInstance"):
+        # Pointers are of type long in Python 2
+        pointer = six.integer_types[-1](pointer)
+        return QtCompat.wrapInstance(pointer, QtWidgets.QMainWindow)
+
+    # No pointer wrapping available for this binding
+    for widget in QtWidgets.QApplication.topLevelWidgets():
+        if widget.objectName() == "MayaWindow":
+            return widget
+
+    return None
+
+
+def register(name, widget):
+    """Keep handle to `widget` by `name`
+
+    Arguments:
+        name (str): Unique name of handle
+        widget (QWidget or str): Widget, held by weak reference, or path
+            to Maya UI, as returned by e.g. `cmds.menu()`
+
+    """
+
+    if isinstance(widget, six.string_types):
+        self._handles[name] = widget
+    else:
+        self._handles[name] = weakref.ref(widget)
+
+
+def get(name):
+    """Return widget or path to Maya UI of `name`, or None if gone"""
+    handle = self._handles.get(name)
+
+    if handle is None:
+        return None
+
+    if isinstance(handle, six.string_types):
+        return handle if cmds.control(handle, exists=True) or \
+            cmds.menu(handle, exists=True) else None
+
+    widget = handle()
+
+    try:
+        # Raises once its C++ object has been deleted
+        widget.objectName()
+    except (AttributeError, RuntimeError):
+        return None
+
+    return widget
+
+
+def delete(name):
+    """Delete widget or Maya UI of `name`, returning whether it existed"""
+    widget = get(name)
+    self._handles.pop(name, None)
+
+    if widget is None:
+        return False
+
+    if isinstance(widget, six.string_types):
+        cmds.deleteUI(widget)
+    else:
+        widget.close()
+        widget.deleteLater()
+
+    return True
+
+
+def deregister(name):
+    """Forget handle of `name`, leaving its widget alone"""
+    self._handles.pop(name, None)
@@ -26,6 +26,18 @@ def parse_settings():
     PYBLISH_QML_PATH = settings.get("PYBLISH_QML", "path")
     PYBLISH_QML_PYTHON = settings.get("PYBLISH_QML", "python")
     PYBLISH_QML_PYQT5 = settings.get("PYBLISH_QML", "pyqt5")
+    JIMINY_CACHE_PATH = (
+        settings.has_option("JIMINY_CACHE", "path") and
+        settings.get("JIMINY_CACHE", "path")
+    )
+    JIMINY_CACHE_SIZE = (
+        settings.has_option("JIMINY_CACHE", "size") and
+        settings.get("JIMINY_CACHE", "size")
+    )
+    PYBLISH_QML_PREWARM = (
+        settings.has_option("PYBLISH_QML", "prewarm") and
+        settings.get("PYBLISH_QML", "prewarm")
+    )
 
     # setup !
 
@@ -36,6 +48,8 @@ def parse_settings():
         sys.path.insert(0, PYBLISH_QML_PATH)
         os.environ["PYBLISH_QML_PYTHON_EXECUTABLE"] = PYBLISH_QML_PYTHON
         os.environ["PYBLISH_QML_PYQT5"] = PYBLISH_QML_PYQT5
+        if PYBLISH_QML_PREWARM:
+            os.environ["JIMINY_QML_PREWARM"] = PYBLISH_QML_PREWARM
         os.environ["PYTHONPATH"] = ";".join(
             [
                 PYBLISH_BASE_PATH,
@@ -51,6 +65,11 @@ def parse_settings():
     sys.path.insert(0, JIMINY_DRESS_PATH)
     os.environ["JIMINY_DRESS"] = JIMINY_DRESS_NAME
 
+    if JIMINY_CACHE_PATH:
+        os.environ["JIMINY_CACHE"] = JIMINY_CACHE_PATH
+    if JIMINY_CACHE_SIZE:
+        os.environ["JIMINY_CACHE_SIZE"] = JIMINY_CACHE_SIZE
+
 
 def initializePlugin(mobject):
     parse_settings()
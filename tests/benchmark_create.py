@@ -0,0 +1,96 @@
+"""Time creation of many instances, one at a time and in bulk
+
+Usage:
+    $ mayapy tests/benchmark_create.py [count]
+
+Creates `count` instances, 1000 by default, in a new scene per run:
+
+    - one at a time with `create()`, imprinting with a command per
+      attribute as prior to `lib.imprint()` batching them
+    - one at a time with `create()`
+    - all at once with `create_many()`
+
+Undo is enabled, as it is interactively.
+
+"""
+
+import sys
+import time
+
+import maya.standalone
+maya.standalone.initialize()
+
+from maya import cmds  # noqa: E402
+
+from jiminy import lib, pipeline  # noqa: E402
+
+
+def imprint_per_attribute(node, data):
+    """`lib.imprint()` prior to batching, for comparison"""
+    for key, value in data.items():
+        if isinstance(value, bool):
+            add_type = {"attributeType": "bool"}
+            set_type = {"keyable": False, "channelBox": True}
+        elif isinstance(value, str):
+            add_type = {"dataType": "string"}
+            set_type = {"type": "string"}
+        else:
+            add_type = {"attributeType": "long"}
+            set_type = {"keyable": False, "channelBox": True}
+
+        cmds.addAttr(node, longName=key, **add_type)
+        cmds.setAttr(node + "." + key, value, **set_type)
+
+
+class BenchmarkCreator(pipeline.Creator):
+    name = "benchmarkDefault"
+    label = "Benchmark"
+    family = "jiminy.benchmark"
+
+
+def _instances(count):
+    return [
+        {"name": "benchmark%04d" % index,
+         "asset": "asset%04d" % index,
+         "family": BenchmarkCreator.family,
+         "data": {"index": index}}
+        for index in range(count)
+    ]
+
+
+def _run(label, function, count):
+    cmds.file(new=True, force=True)
+    cmds.undoInfo(state=True, infinity=True)
+
+    started = time.time()
+    function(_instances(count))
+    duration = time.time() - started
+
+    assert len(lib.lsattr("id", pipeline.INSTANCE_ID)) == count
+
+    print("%-32s %8.3fs %8.3fms/instance" % (
+        label, duration, duration * 1000.0 / count))
+    return duration
+
+
+def _one_at_a_time(instances):
+    for instance in instances:
+        pipeline.create(**instance)
+
+
+def main(count=1000):
+    pipeline.register_plugin(pipeline.Creator, BenchmarkCreator)
+
+    imprint = lib.imprint
+    lib.imprint = imprint_per_attribute
+    try:
+        _run("create(), imprint per attribute", _one_at_a_time, count)
+    finally:
+        lib.imprint = imprint
+
+    _run("create()", _one_at_a_time, count)
+    _run("create_many()", pipeline.create_many, count)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
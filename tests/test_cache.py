@@ -0,0 +1,123 @@
+"""Tests of jiminy.cache, which requires neither Maya nor pyblish"""
+
+import os
+import time
+import hashlib
+
+import pytest
+
+from jiminy import cache
+
+
+@pytest.fixture
+def root(tmpdir):
+    cache.install(str(tmpdir.join("cache")), maxsize=250)
+    yield tmpdir
+    cache.uninstall()
+
+
+def _publish(tmpdir, name, size=100):
+    path = tmpdir.join("publish", name)
+    path.write(name[0] * size, ensure=True)
+    return str(path)
+
+
+def _age(local, seconds):
+    """Make copy at `local` look last used `seconds` ago"""
+    used = time.time() - seconds
+    os.utime(os.path.dirname(local) + ".json", (used, used))
+
+
+def test_not_installed(tmpdir):
+    path = _publish(tmpdir, "a.ma")
+    assert cache.localize(path) == path
+
+
+def test_localize_copies_once(root):
+    path = _publish(root, "a.ma")
+
+    local = cache.localize(path)
+    assert local != path
+    assert open(local).read() == open(path).read()
+
+    assert cache.localize(path) == local
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["bytesCopied"] == 100
+
+
+def test_localize_stale(root):
+    path = _publish(root, "a.ma")
+    cache.localize(path)
+
+    with open(path, "a") as f:
+        f.write("changed")
+
+    local = cache.localize(path)
+    assert open(local).read() == open(path).read()
+    assert cache.stats()["stale"] == 1
+
+
+def test_localize_checksum(root):
+    path = _publish(root, "a.ma")
+    checksum = "sha1:" + hashlib.sha1(b"a" * 100).hexdigest()
+
+    local = cache.localize(path, checksum)
+    assert local != path
+    assert cache.localize(path, checksum) == local
+
+    # Copies which don't match aren't kept
+    other = _publish(root, "b.ma")
+    assert cache.localize(other, checksum) == other
+    assert cache.stats()["corrupt"] == 1
+
+
+def test_larger_than_cache(root):
+    path = _publish(root, "a.ma", size=300)
+    assert cache.localize(path) == path
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_evicts_least_recently_used(root):
+    first = cache.localize(_publish(root, "a.ma"))
+    second = cache.localize(_publish(root, "b.ma"))
+
+    _age(first, cache.GRACE * 3)
+    _age(second, cache.GRACE * 2)
+
+    third = cache.localize(_publish(root, "c.ma"))
+
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
+    assert os.path.exists(third)
+    assert cache.stats()["evictions"] == 1
+    assert cache.size() == 200
+
+
+def test_recently_used_not_evicted(root):
+    """Copies within `GRACE` may still be read, and are kept"""
+    first = cache.localize(_publish(root, "a.ma"))
+    second = cache.localize(_publish(root, "b.ma"))
+    third = cache.localize(_publish(root, "c.ma"))
+
+    for local in (first, second, third):
+        assert os.path.exists(local)
+
+    assert cache.stats()["evictions"] == 0
+    assert cache.size() == 300
+
+
+def test_in_use_not_evicted(root):
+    first = cache.localize(_publish(root, "a.ma"))
+    second = cache.localize(_publish(root, "b.ma"))
+
+    _age(first, cache.GRACE * 3)
+    _age(second, cache.GRACE * 2)
+
+    with cache.FileLock(os.path.dirname(first) + ".lock"):
+        cache.localize(_publish(root, "c.ma"))
+
+    assert os.path.exists(first)
+    assert not os.path.exists(second)
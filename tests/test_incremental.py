@@ -0,0 +1,98 @@
+"""Tests of jiminy.incremental, run with mayapy -m pytest tests"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+cmds = pytest.importorskip("maya.cmds")
+pyblish_api = pytest.importorskip("pyblish.api")
+pyblish_util = pytest.importorskip("pyblish.util")
+
+from pyblish.plugin import Provider  # noqa: E402
+
+from jiminy import lib, incremental, pipeline  # noqa: E402
+
+processed = list()
+
+
+class CollectInstances(pyblish_api.ContextPlugin):
+    order = pyblish_api.CollectorOrder
+
+    def process(self, context):
+        for node in lib.lsattr("id", pipeline.INSTANCE_ID):
+            instance = context.create_instance(node)
+            instance.data["objectName"] = node
+            instance.data["family"] = "jiminy.model"
+
+
+class ExtractModel(pyblish_api.InstancePlugin):
+    order = pyblish_api.ExtractorOrder
+    families = ["jiminy.model"]
+
+    @incremental.cached
+    def process(self, instance):
+        processed.append(instance.name)
+        instance.data["extracted"] = True
+
+
+def setup_module():
+    try:
+        import maya.standalone
+        maya.standalone.initialize()
+    except ImportError:
+        pass
+
+
+@pytest.fixture
+def scene():
+    tempdir = tempfile.mkdtemp()
+
+    cmds.file(new=True, force=True)
+    cmds.file(rename=os.path.join(tempdir, "scene.ma"))
+    cmds.file(save=True, type="mayaAscii")
+
+    pyblish_api.deregister_all_plugins()
+    pyblish_api.register_plugin(CollectInstances)
+    pyblish_api.register_plugin(ExtractModel)
+    processed[:] = []
+
+    yield tempdir
+
+    pyblish_api.deregister_all_plugins()
+    shutil.rmtree(tempdir)
+
+
+def _publish():
+    context = pyblish_util.publish()
+
+    for result in context.data["results"]:
+        assert result["error"] is None, result["error"]
+
+    return context
+
+
+def test_cached_signature():
+    """pyblish provides `instance` alone to decorated plug-ins"""
+    assert Provider.args(ExtractModel.process) == ["instance"]
+
+
+def test_cached_skipped_when_unchanged(scene):
+    cube, _ = cmds.polyCube(name="cube")
+    instance = cmds.sets(cube, name="modelDefault")
+    lib.imprint(instance, {"id": pipeline.INSTANCE_ID,
+                           "family": "jiminy.model"})
+
+    _publish()
+    assert processed == ["modelDefault"]
+
+    context = _publish()
+    assert processed == ["modelDefault"], "Unchanged instance processed"
+    assert context[0].data["extracted"] is True
+    assert context[0].data["reused"]
+
+    cmds.setAttr(cube + ".translateX", 1)
+
+    _publish()
+    assert processed == ["modelDefault", "modelDefault"]
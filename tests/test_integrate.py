@@ -0,0 +1,134 @@
+"""Tests of jiminy.integrate, run with mayapy -m pytest tests"""
+
+import os
+import stat
+import hashlib
+
+import pytest
+
+pytest.importorskip("maya.cmds")
+pytest.importorskip("pyblish.api")
+
+from jiminy import integrate, pipeline  # noqa: E402
+
+
+@pytest.fixture
+def root(tmpdir, monkeypatch):
+    monkeypatch.setattr(pipeline, "registered_root", lambda: str(tmpdir))
+    monkeypatch.setattr(integrate, "CHECKSUMS",
+                        str(tmpdir.join("checksums.json")))
+    monkeypatch.setattr(integrate, "_hashes", None)
+    return tmpdir
+
+
+def _staging(tmpdir, name, content):
+    path = tmpdir.join("staging", name)
+    path.write(content, ensure=True)
+    return str(path)
+
+
+def _sha1(content):
+    return "sha1:" + hashlib.sha1(content).hexdigest()
+
+
+def test_copy_checksum(root):
+    src = _staging(root, "model.abc", "model")
+    dst = str(root.join("publish", "v001", "model.abc"))
+
+    assert integrate.copy(src, dst) == _sha1(b"model")
+    assert open(dst).read() == "model"
+
+    # Temporary files are renamed into place
+    assert os.listdir(os.path.dirname(dst)) == ["model.abc"]
+
+
+def test_copy_without_checksum(root):
+    src = _staging(root, "model.abc", "model")
+    dst = str(root.join("publish", "model.abc"))
+
+    assert integrate.copy(src, dst, algorithm=None) is None
+    assert open(dst).read() == "model"
+
+
+def test_copy_shrinking_source(root, monkeypatch):
+    """A copy of fewer bytes than the source had fails, leaving nothing"""
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("No os.copy_file_range")
+
+    src = _staging(root, "model.abc", "model")
+    dst = str(root.join("publish", "model.abc"))
+
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0)
+
+    with pytest.raises(IOError):
+        integrate.copy(src, dst, algorithm=None)
+
+    assert os.listdir(os.path.dirname(dst)) == []
+
+
+def test_checksum_of(root):
+    src = _staging(root, "model.abc", "model")
+    assert integrate.checksum_of(src) == _sha1(b"model")
+
+    integrate.save_checksums()
+    assert os.path.exists(integrate.CHECKSUMS)
+
+
+def test_deduplicate(root):
+    first = _staging(root, "a.png", "texture")
+    second = _staging(root, "b.png", "texture")
+
+    checksum, existing, method = integrate.deduplicate(
+        first, str(root.join("publish", "v001", "a.png")))
+
+    assert checksum == _sha1(b"texture")
+    assert not existing
+
+    checksum, existing, method = integrate.deduplicate(
+        second, str(root.join("publish", "v002", "b.png")))
+
+    assert existing, "Identical file copied twice"
+
+    stored = integrate.store_path(checksum)
+    assert open(stored).read() == "texture"
+    assert not os.stat(stored).st_mode & stat.S_IWUSR
+
+    if method == "hardlink":
+        assert os.stat(stored).st_nlink == 3
+
+
+def test_integrate(root):
+    transfers = [
+        (_staging(root, "model.abc", "model"),
+         str(root.join("publish", "model.abc"))),
+        (_staging(root, "model.ma", "scene"),
+         str(root.join("publish", "model.ma"))),
+    ]
+
+    results = integrate.integrate(transfers, dedupe=False)
+
+    for src, dst in transfers:
+        assert open(dst).read() == open(src).read()
+        assert results[dst]["size"] == os.path.getsize(src)
+
+    assert results[transfers[0][1]]["checksum"] == _sha1(b"model")
+    assert sorted(os.listdir(str(root.join("publish")))) == [
+        "model.abc", "model.ma"]
+
+
+def test_integrate_failure_keeps_existing(root):
+    """Files overwritten are as they were, should any transfer fail"""
+    existing = root.join("publish", "model.abc")
+    existing.write("previous", ensure=True)
+
+    transfers = [
+        (_staging(root, "model.abc", "model"), str(existing)),
+        (str(root.join("staging", "missing.ma")),
+         str(root.join("publish", "model.ma"))),
+    ]
+
+    with pytest.raises(IOError):
+        integrate.integrate(transfers, dedupe=False)
+
+    assert existing.read() == "previous"
+    assert os.listdir(str(root.join("publish"))) == ["model.abc"]
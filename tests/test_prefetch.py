@@ -0,0 +1,82 @@
+"""Tests of jiminy.prefetch, run with mayapy -m pytest tests"""
+
+import os
+
+import pytest
+
+pytest.importorskip("maya.cmds")
+pytest.importorskip("pyblish.api")
+
+from jiminy import prefetch, cache  # noqa: E402
+
+
+@pytest.fixture
+def publish(tmpdir, monkeypatch):
+    monkeypatch.setattr(prefetch, "_stats", dict())
+
+    paths = list()
+    for name in ("a.abc", "b.abc", "c.abc"):
+        path = tmpdir.join("publish", name)
+        path.write(name * 10, ensure=True)
+        paths.append(str(path))
+
+    yield paths
+
+    cache.uninstall()
+
+
+def test_prefetch(publish):
+    assert prefetch.prefetch(publish) == 3
+    prefetch.wait()
+
+    stats = prefetch.stats()
+    assert stats["files"] == 3
+    assert stats["bytes"] == sum(os.path.getsize(path) for path in publish)
+    assert stats["errors"] == 0
+
+
+def test_prefetch_missing(publish, tmpdir):
+    prefetch.prefetch([str(tmpdir.join("missing.abc"))])
+    prefetch.wait()
+
+    assert prefetch.stats()["errors"] == 1
+
+    # Reading threads survive errors
+    prefetch.prefetch(publish)
+    prefetch.wait()
+
+    assert prefetch.stats()["files"] == 3
+
+
+def test_prefetch_localize(publish, tmpdir):
+    """Files prefetched to the cache are served from it thereafter"""
+    cache.install(str(tmpdir.join("cache")))
+
+    prefetch.prefetch(publish, localize=True)
+    prefetch.wait()
+
+    assert cache.stats()["misses"] == 3
+
+    for path in publish:
+        local = cache.localize(path)
+        assert local != path
+        assert open(local).read() == open(path).read()
+
+    assert cache.stats()["hits"] == 3
+
+
+def test_prefetch_scene(publish, tmpdir):
+    """Files referenced by a Maya Ascii scene are read"""
+    scene = tmpdir.join("scene.ma")
+    scene.write(
+        '//Maya ASCII 2018 scene\n'
+        'file -rdi 1 -ns "a" -rfn "aRN"\n'
+        '\t -typ "Alembic" "%s";\n'
+        'file -r -ns "b" -dr 1 -rfn "bRN" "%s";\n'
+        'requires maya "2018";\n' % (publish[0], publish[1])
+    )
+
+    assert prefetch.prefetch_scene(str(scene)) == 2
+    prefetch.wait()
+
+    assert prefetch.stats()["files"] == 2